@@ -0,0 +1,106 @@
+"""Throughput of the filtration curve and schedule windows.
+
+Collected by the pytest-benchmark suite; also runnable as a plain script
+for a quick comparison:  python benchmarks/bench_calculation.py
+"""
+import datetime
+import importlib.util
+import pathlib
+import random
+import timeit
+
+import pytest
+
+_ROOT = pathlib.Path(__file__).resolve().parents[1]
+_spec = importlib.util.spec_from_file_location(
+    "spm_calculation", _ROOT / "custom_components" / "swimming_pool_manager" / "calculation.py"
+)
+calculation = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(calculation)
+
+N = 100_000
+
+
+def legacy_cubic(temp_celsius, coef_pct):
+    # the implementation before the Horner / batch rework, kept as the baseline
+    t = float(temp_celsius)
+    scale = float(coef_pct) / 100.0
+    a = calculation._BASE_A * scale
+    b = calculation._BASE_B * scale
+    c = calculation._BASE_C * scale
+    d = calculation._BASE_D * scale
+    hours = (a * (t ** 3)) + (b * (t ** 2)) + (c * t) + d
+    hours_clamped = max(calculation.MIN_HOURS, min(calculation.MAX_HOURS, float(hours)))
+    calculation.LOGGER.debug("Cubic calc: T=%.2f coef=%s -> raw=%.3f clamped=%.3f", t, coef_pct, hours, hours_clamped)
+    return hours_clamped
+
+
+def _rate(label, seconds, count=N):
+    print(f"{label:<28} {count / seconds / 1e6:8.2f} M evals/s")
+
+
+def main():
+    rng = random.Random(0)
+    temps = [rng.uniform(0.0, 35.0) for _ in range(N)]
+    coefs = [rng.choice((50, 80, 100)) for _ in range(N)]
+    pairs = list(zip(temps, coefs))
+    table = calculation.FiltrationCurveTable()
+
+    _rate("legacy scalar", min(timeit.repeat(lambda: [legacy_cubic(t, c) for t, c in pairs], number=1, repeat=5)))
+    _rate("horner scalar", min(timeit.repeat(lambda: [calculation.compute_filtration_duration_cubic(t, c) for t, c in pairs], number=1, repeat=5)))
+    _rate("table lookup", min(timeit.repeat(lambda: [table.lookup(t, c) for t, c in pairs], number=1, repeat=5)))
+    try:
+        import numpy as np
+    except ImportError:
+        print(f"{'numpy batch':<28} skipped (numpy not installed)")
+        return
+    t_arr = np.asarray(temps)
+    c_arr = np.asarray(coefs, dtype=float)
+    _rate("numpy batch", min(timeit.repeat(lambda: calculation.compute_filtration_duration_batch(t_arr, c_arr), number=1, repeat=5)))
+
+
+TEMPS = [random.Random(0).uniform(0.0, 35.0) for _ in range(1000)]
+
+
+def bench_legacy_cubic(benchmark):
+    benchmark.group = "filtration_curve"
+    benchmark(lambda: [legacy_cubic(t, 80) for t in TEMPS])
+
+
+def bench_cubic(benchmark):
+    benchmark.group = "filtration_curve"
+    benchmark(lambda: [calculation.compute_filtration_duration_cubic(t, 80) for t in TEMPS])
+
+
+def bench_curve_table(benchmark):
+    table = calculation.FiltrationCurveTable()
+    benchmark.group = "filtration_curve"
+    benchmark(lambda: [table.lookup(t, 80) for t in TEMPS])
+
+
+def bench_curve_batch(benchmark):
+    np = pytest.importorskip("numpy")
+    temps = np.asarray(TEMPS)
+    benchmark.group = "filtration_curve"
+    benchmark(calculation.compute_filtration_duration_batch, temps, 80)
+
+
+# a fleet of 100 pools asking for their windows ten times a day
+DURATIONS = [calculation.compute_filtration_duration_cubic(t, 100) for t in TEMPS[:100]] * 10
+
+
+def bench_schedule_windows_cached(benchmark):
+    day = datetime.date(2025, 7, 1)
+    benchmark.group = "schedule_windows"
+    benchmark(lambda: [calculation.compute_schedule_windows("14:00", 30, h, day) for h in DURATIONS])
+
+
+def bench_schedule_windows_uncached(benchmark):
+    day = datetime.date(2025, 7, 1)
+    build = calculation._cached_windows.__wrapped__
+    benchmark.group = "schedule_windows"
+    benchmark(lambda: [build(day, "14:00", 30, int(round(h * 60))) for h in DURATIONS])
+
+
+if __name__ == "__main__":
+    main()
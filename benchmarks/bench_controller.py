@@ -0,0 +1,103 @@
+"""Controller hot paths: pivot latency across fleet sizes, loop stalls of tariff plans and shared timer heap churn."""
+import asyncio
+from time import perf_counter
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.swimming_pool_manager.planner import PlanExecutor  # noqa: E402
+from custom_components.swimming_pool_manager.scheduler import PoolScheduler  # noqa: E402
+
+
+@pytest.mark.parametrize("size", [1, 100, 1000])
+def bench_handle_pivot(benchmark, make_fleet, size):
+    fleet = make_fleet(size)
+    now = fleet.scheduler.now()
+
+    async def pivot_all():
+        await asyncio.gather(*(controller._handle_pivot(now) for controller in fleet.controllers))
+        await fleet.hass.async_block_till_done()
+
+    benchmark.group = "handle_pivot"
+    benchmark.extra_info['controllers'] = size
+    benchmark(lambda: fleet.run(pivot_all()))
+    benchmark.extra_info['armed_timers'] = fleet.scheduler.pending
+    if benchmark.stats:
+        # None under --benchmark-disable
+        benchmark.extra_info['per_controller_us'] = benchmark.stats.stats.mean / size * 1e6
+
+
+# two-rate tariff: cheap nights, so every pool runs the optimizer
+TARIFF = [(0, 0.15), (6 * 60, 0.25), (22 * 60, 0.15)]
+
+
+@pytest.mark.parametrize("executor", ["inline", "thread"])
+def bench_fleet_pivot_loop_block(benchmark, make_fleet, executor):
+    """Fleet-wide tariff pivot of 100 pools, plans computed on the loop vs in the plan executor threads.
+
+    extra_info holds the worst loop stall seen by a 1 ms sleep probe.
+    """
+    fleet = make_fleet(100)
+    loop = fleet.loop
+    for controller in fleet.controllers:
+        controller._tariff_profile = TARIFF
+    if executor == "thread":
+        planner = PlanExecutor(fleet.hass)
+        for controller in fleet.controllers:
+            controller._planner = planner
+    now = fleet.scheduler.now()
+    stalls = []
+
+    async def pivot_all():
+        done = asyncio.Event()
+
+        async def probe():
+            worst = 0.0
+            while not done.is_set():
+                started = perf_counter()
+                await asyncio.sleep(0.001)
+                worst = max(worst, perf_counter() - started - 0.001)
+            stalls.append(worst * 1000.0)
+
+        task = loop.create_task(probe())
+        await asyncio.sleep(0)
+        # new day each round so the optimizer cache does not absorb the work
+        for controller in fleet.controllers:
+            controller._tariff_masks.clear()
+        await asyncio.gather(*(controller._handle_pivot(now) for controller in fleet.controllers))
+        done.set()
+        await task
+
+    benchmark.group = "fleet_loop_block"
+    benchmark.pedantic(lambda: fleet.run(pivot_all()), rounds=3, iterations=1)
+    benchmark.extra_info['probe_max_stall_ms'] = round(max(stalls), 2)
+    if executor == "thread":
+        # with the inline executor the compute hides inside the await, so the metric is only meaningful here
+        blocks = [controller.metrics.loop_block_ms.percentile(100) for controller in fleet.controllers]
+        benchmark.extra_info['plan_loop_block_max_ms'] = round(max(blocks), 2)
+        planner.async_shutdown()
+
+
+@pytest.mark.parametrize("size", [1000, 10000])
+def bench_scheduler_insert_cancel(benchmark, make_fleet, size):
+    fleet = make_fleet(0)
+    scheduler = PoolScheduler(fleet.hass)
+    scheduler._arm = lambda: None  # no loop timer: measure the heap only
+    base = fleet.scheduler.now().timestamp()
+    deadlines = [dt_util.utc_from_timestamp(base + i) for i in range(size)]
+
+    def churn():
+        handles = [scheduler.async_schedule_at(when, _noop) for when in deadlines]
+        for handle in handles:
+            handle.cancel()
+
+    benchmark.group = "scheduler"
+    benchmark(churn)
+    assert scheduler.pending == 0
+
+
+def _noop(now):
+    pass
@@ -0,0 +1,85 @@
+"""State-write rate of coordinator entities (sensor.py, binary_sensor.py)."""
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.swimming_pool_manager.binary_sensor import FiltrationActiveBinarySensor, FrostProtectionBinarySensor  # noqa: E402
+from custom_components.swimming_pool_manager.sensor import DIAGNOSTIC_SENSORS, PoolDiagnosticSensor, PoolFiltrationSensor  # noqa: E402
+
+SNAPSHOTS = 1000
+
+
+def _attach(entity):
+    writes = [0]
+
+    def _write():
+        writes[0] += 1
+
+    entity.async_write_ha_state = _write
+    entity.coordinator.async_add_listener(entity._handle_coordinator_update)
+    return writes
+
+
+@pytest.mark.parametrize("change_every", [1, 10, 100])
+def bench_entity_state_writes(benchmark, make_fleet, change_every):
+    """Publish SNAPSHOTS snapshots where the plan changes every change_every-th one."""
+    fleet = make_fleet(1)
+    controller = fleet.controllers[0]
+    fleet.run(controller._handle_pivot(fleet.scheduler.now()))
+    entities = [
+        PoolFiltrationSensor(controller, controller.entry_id),
+        FiltrationActiveBinarySensor(controller),
+        FrostProtectionBinarySensor(controller),
+    ]
+    counters = [_attach(entity) for entity in entities]
+    base_hours = controller.data.filtration_hours
+    published = [0]
+
+    def publish():
+        published[0] += SNAPSHOTS
+        for i in range(SNAPSHOTS):
+            controller.data.filtration_hours = base_hours + (i // change_every) * 0.1
+            controller.data.filtration_active = bool((i // change_every) % 2)
+            controller._publish()
+
+    benchmark.group = "entity_writes"
+    benchmark(publish)
+    if benchmark.stats:
+        # None under --benchmark-disable
+        benchmark.extra_info['snapshots_per_s'] = SNAPSHOTS / benchmark.stats.stats.mean
+    # counted per call, so calibration runs do not skew the ratio
+    benchmark.extra_info['writes_per_snapshot'] = sum(c[0] for c in counters) / (published[0] * len(entities))
+
+
+class PerSensorDiagnosticSensor(PoolDiagnosticSensor):
+    """Diagnostic sensor as first shipped: every sensor rebuilt the full diagnostics on each publish."""
+
+    def _extract(self, data):
+        value = self._value_fn(self.controller.diagnostics())
+        if isinstance(value, dict):
+            p95, p50, high = (None if value[k] is None else round(value[k], 1) for k in ('p95', 'p50', 'max'))
+            return p95, {'p50': p50, 'max': high}
+        return value, None
+
+
+@pytest.mark.parametrize("layout", ["per_sensor", "shared"])
+def bench_diagnostic_fanout(benchmark, make_fleet, layout):
+    """Publishes of one pool with its diagnostic sensors attached and full metric windows."""
+    fleet = make_fleet(1)
+    controller = fleet.controllers[0]
+    fleet.run(controller._handle_pivot(fleet.scheduler.now()))
+    for i in range(256):
+        for buffer in (controller.metrics.pivot_ms, controller.metrics.loop_block_ms, controller.metrics.timer_drift_ms, controller.metrics.start_jitter_ms):
+            buffer.append(float(i % 37))
+    cls = PerSensorDiagnosticSensor if layout == "per_sensor" else PoolDiagnosticSensor
+    for spec in DIAGNOSTIC_SENSORS:
+        _attach(cls(controller, controller.entry_id, *spec))
+
+    def publish():
+        for _ in range(100):
+            controller._publish()
+
+    benchmark.group = "diagnostic_fanout"
+    benchmark(publish)
+    if benchmark.stats:
+        benchmark.extra_info['publish_us'] = benchmark.stats.stats.mean / 100 * 1e6
@@ -0,0 +1,149 @@
+"""Per-pool memory of the controller state and the number/select/binary entities, dict layout vs slotted."""
+import copy
+import tracemalloc
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.swimming_pool_manager.binary_sensor import FiltrationActiveBinarySensor, FrostProtectionBinarySensor  # noqa: E402
+from custom_components.swimming_pool_manager.calculation import ScheduleWindow  # noqa: E402
+from custom_components.swimming_pool_manager.number import AdjustCoeffNumber, AntiFreezeNumber, CutDurationNumber, PauseNumber  # noqa: E402
+from custom_components.swimming_pool_manager.select import PivotSelect, TIME_OPTIONS  # noqa: E402
+from custom_components.swimming_pool_manager.state import PoolConfig, PoolState  # noqa: E402
+
+POOLS = 500
+
+NUMBERS = [
+    (AdjustCoeffNumber, "Adjust Coeff", "adjust_coeff", 10, 100, 1),
+    (PauseNumber, "Pause Minutes", "pause_minutes", 0, 1440, 1),
+    (CutDurationNumber, "Cut Duration Min", "cut_minutes", 1, 1440, 1),
+    (AntiFreezeNumber, "No Frost Temp", "nofrost_temp", -20, 20, 0.1),
+]
+
+
+class LegacyWindow:
+    """ScheduleWindow before epoch storage: datetimes, ISO strings and float timestamps per edge."""
+
+    __slots__ = ('start', 'end', 'start_iso', 'end_iso', 'start_ts', 'end_ts')
+
+    def __init__(self, start, end):
+        self.start, self.end = start, end
+        self.start_iso, self.end_iso = start.isoformat(), end.isoformat()
+        self.start_ts, self.end_ts = start.timestamp(), end.timestamp()
+
+
+class _PerInstanceIds:
+    """Entity naming before slotting: name and unique_id are per-instance attributes, as on a plain HA entity."""
+
+    name = property(lambda self: self._attr_name)
+    unique_id = property(lambda self: self._attr_unique_id)
+
+
+_LEGACY = {
+    cls: type(f"Legacy{cls.__name__}", (_PerInstanceIds, cls), {})
+    for cls in [spec[0] for spec in NUMBERS] + [PivotSelect, FiltrationActiveBinarySensor, FrostProtectionBinarySensor]
+}
+
+
+def _legacy_entities(controller):
+    """Entities as they were built before: per-instance names, ids, ranges and back-references."""
+    entry_id = controller.entry_id
+    entities = []
+    for cls, label, suffix, low, high, step in NUMBERS:
+        entity = _LEGACY[cls].__new__(_LEGACY[cls])
+        entity.controller = controller
+        entity._attr_should_poll = False
+        entity._attr_name = f"Pool {label} {entry_id}"
+        entity._attr_unique_id = f"{entry_id}_{suffix}"
+        entity._attr_native_min_value = low
+        entity._attr_native_max_value = high
+        entity._attr_native_step = step
+        entities.append(entity)
+    select = _LEGACY[PivotSelect].__new__(_LEGACY[PivotSelect])
+    select.controller = controller
+    select._entry_id = entry_id
+    select._attr_should_poll = False
+    select._attr_name = f"Pool Pivot Hour {entry_id}"
+    select._attr_unique_id = f"{entry_id}_pivot_select"
+    select._attr_options = TIME_OPTIONS
+    select._attr_current_option = controller.config.get('pivot_hour')
+    entities.append(select)
+    for cls, label, suffix in ((FiltrationActiveBinarySensor, "Filtration Active", "filtration_active_bs"), (FrostProtectionBinarySensor, "Frost Protection", "frost_bs")):
+        entity = _LEGACY[cls](controller)
+        entity._attr_name = f"Pool {label} {entry_id}"
+        entity._attr_unique_id = f"{entry_id}_{suffix}"
+        entities.append(entity)
+    return entities
+
+
+def _slotted_entities(controller):
+    return [spec[0](controller) for spec in NUMBERS] + [PivotSelect(controller)] + [
+        FiltrationActiveBinarySensor(controller), FrostProtectionBinarySensor(controller),
+    ]
+
+
+def _registered(entities):
+    """Entities with the name and unique_id strings HA reads and keeps for each of them, whichever layout built them."""
+    return [(entity, entity.name, entity.unique_id) for entity in entities]
+
+
+def _pool(i, config, start, layout):
+    """Config, runtime state, one published snapshot and two distinct, rendered windows of pool i."""
+    edges = [start + timedelta(minutes=i + k * 90) for k in range(4)]
+    if layout == "legacy":
+        options = dict(config, water_temp_sensor=f"sensor.water_{i}", pump_switch=f"switch.pump_{i}")
+        windows = [LegacyWindow(edges[0], edges[1]), LegacyWindow(edges[2], edges[3])]
+        data = {
+            'filtration_active': False, 'mode': 'ete', 'pivot_hour': options['pivot_hour'],
+            'pause_minutes': 30, 'adjust_coeff_pct': 100, 'filtration_hours': 6.0 + i / POOLS,
+            'schedule_windows': windows,
+        }
+        return options, data, dict(data)
+    options = PoolConfig(config, water_temp_sensor=f"sensor.water_{i}", pump_switch=f"switch.pump_{i}")
+    windows = (ScheduleWindow(edges[0], edges[1]), ScheduleWindow(edges[2], edges[3]))
+    for window in windows:
+        # count the memoized datetimes and ISO strings a rendered window keeps
+        window.start_iso, window.end_iso
+    data = PoolState(
+        mode='ete', pivot_hour=options['pivot_hour'], pause_minutes=30, adjust_coeff_pct=100,
+        filtration_hours=6.0 + i / POOLS, schedule_windows=windows,
+    )
+    return options, data, data.copy()
+
+
+def _footprint(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [build(i) for i in range(POOLS)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del kept
+    return size / POOLS
+
+
+@pytest.mark.parametrize("layout", ["legacy", "slotted"])
+def bench_pool_footprint(benchmark, make_fleet, layout):
+    """Bytes per pool for POOLS pools; each pool has its own controller, only entity-owned state and id strings are counted."""
+    fleet = make_fleet(1)
+    controller = fleet.controllers[0]
+    config = dict(controller.config)
+    start = fleet.scheduler.now()
+    # one controller per pool as in HA, built outside the measured window
+    controllers = [copy.copy(controller) for _ in range(POOLS)]
+    for i, pool in enumerate(controllers):
+        pool.entry_id = f"entry_{i}"
+    entities = _legacy_entities if layout == "legacy" else _slotted_entities
+    result = {}
+
+    def run():
+        result['state'] = _footprint(lambda i: _pool(i, config, start, layout))
+        result['entities'] = _footprint(lambda i: _registered(entities(controllers[i])))
+
+    benchmark.group = "pool_memory"
+    benchmark.pedantic(run, rounds=1, iterations=1)
+    benchmark.extra_info['state_bytes_per_pool'] = round(result['state'])
+    benchmark.extra_info['entity_bytes_per_pool'] = round(result['entities'])
+    benchmark.extra_info['bytes_per_pool'] = round(result['state'] + result['entities'])
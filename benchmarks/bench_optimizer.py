@@ -0,0 +1,19 @@
+"""Tariff optimizer: one day of 15-minute slots under run/pause constraints."""
+import random
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.swimming_pool_manager.optimizer import optimize_slots  # noqa: E402
+
+SLOTS = 96
+
+
+@pytest.mark.parametrize("needed,min_run,max_pause", [(24, 1, None), (56, 4, 16), (40, 8, 8)])
+def bench_optimize_day(benchmark, needed, min_run, max_pause):
+    rng = random.Random(3)
+    costs = [round(rng.uniform(0.1, 0.4), 3) for _ in range(SLOTS)]
+    benchmark.group = "tariff_optimizer"
+    mask = benchmark(optimize_slots, costs, needed, min_run, max_pause)
+    assert sum(mask) == needed
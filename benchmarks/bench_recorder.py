@@ -0,0 +1,123 @@
+"""Recorder load of one pool over a simulated day: state rows and attribute bytes, legacy vs current entities."""
+import json
+import math
+import random
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.swimming_pool_manager.sensor import DIAGNOSTIC_SENSORS, PoolDiagnosticSensor, PoolFiltrationSensor  # noqa: E402
+
+POLL_SECONDS = 30
+DAY_MINUTES = 24 * 60
+
+
+class LegacyFiltrationSensor(PoolFiltrationSensor):
+    """Attribute layout and write pattern before compact attributes: polled, everything recorded."""
+
+    _unrecorded_attributes = frozenset()
+
+    def _extract(self, data):
+        hours = data.get('filtration_hours')
+        if hours is None:
+            return None, {}
+        windows = data.get('schedule_windows') or []
+        return round(hours, 2), {
+            'pivot': data.get('pivot_hour'),
+            'pause_minutes': data.get('pause_minutes'),
+            'coef_pct': data.get('adjust_coeff_pct'),
+            'windows': [{'start': w.start_iso, 'end': w.end_iso} for w in windows],
+        }
+
+
+class LegacyDiagnosticSensor(PoolDiagnosticSensor):
+    _unrecorded_attributes = frozenset()
+
+    def _extract(self, data):
+        value = self._value_fn(self.controller.diagnostics())
+        if isinstance(value, dict):
+            return (None if value['p95'] is None else round(value['p95'], 1)), value
+        return value, None
+
+
+class RecorderTap:
+    """What the recorder keeps: a states row per state_changed, attributes deduplicated by content."""
+
+    def __init__(self):
+        self.rows = 0
+        self.attribute_bytes = 0
+        self._last = {}
+        self._shared = set()
+
+    def write(self, entity):
+        state = entity.native_value
+        attributes = entity.extra_state_attributes or {}
+        if self._last.get(id(entity)) == (state, attributes):
+            # same state and attributes: no state_changed event, nothing recorded
+            return
+        self._last[id(entity)] = (state, attributes)
+        self.rows += 1
+        recorded = {k: v for k, v in attributes.items() if k not in entity._unrecorded_attributes}
+        shared = json.dumps(recorded, sort_keys=True, default=str)
+        if shared not in self._shared:
+            self._shared.add(shared)
+            self.attribute_bytes += len(shared)
+
+
+def _entities(controller, legacy):
+    sensor_cls, diag_cls = (LegacyFiltrationSensor, LegacyDiagnosticSensor) if legacy else (PoolFiltrationSensor, PoolDiagnosticSensor)
+    return [sensor_cls(controller, controller.entry_id)] + [
+        diag_cls(controller, controller.entry_id, *spec) for spec in DIAGNOSTIC_SENSORS if spec[0] != 'robot_latency'
+    ]
+
+
+def _run_day(fleet, legacy):
+    controller = fleet.controllers[0]
+    hass = fleet.hass
+    water, outdoor = controller.config['water_temp_sensor'], controller.config['outdoor_temp_entity']
+    tap = RecorderTap()
+    entities = _entities(controller, legacy)
+    for entity in entities:
+        entity.async_write_ha_state = (lambda e=entity: tap.write(e))
+        if not legacy:
+            controller.coordinator.async_add_listener(entity._handle_coordinator_update)
+    rng = random.Random(7)
+
+    async def day():
+        await controller.initialize()
+        start = fleet.scheduler.now()
+        for minute in range(1, DAY_MINUTES + 1):
+            now = start + timedelta(minutes=minute)
+            await fleet.scheduler.async_advance_to(now)
+            hour = minute / 60.0
+            hass.states.async_set(water, round(26.0 + 0.8 * math.sin(hour / 24.0 * 2 * math.pi) + rng.gauss(0.0, 0.05), 2))
+            hass.states.async_set(outdoor, round(20.0 + 6.0 * math.sin(hour / 24.0 * 2 * math.pi), 1))
+            controller._record('water', hass.states.get(water))
+            controller._record('outdoor', hass.states.get(outdoor))
+            await controller._async_evaluate_temperatures()
+            await hass.async_block_till_done()
+            if legacy:
+                # polled entities rebuilt their attributes every scan interval
+                for _ in range(60 // POLL_SECONDS):
+                    for entity in entities:
+                        entity._value = entity._extract(controller.coordinator.data or {})
+                        entity.async_write_ha_state()
+
+    fleet.run(day())
+    return tap
+
+
+@pytest.mark.parametrize("layout", ["legacy", "compact"])
+def bench_recorder_rows_per_day(benchmark, make_fleet, layout):
+    """One simulated day of minute-level temperatures; extra_info holds the recorder load."""
+    taps = []
+
+    def run():
+        taps.append(_run_day(make_fleet(1), layout == "legacy"))
+
+    benchmark.group = "recorder_rows"
+    benchmark.pedantic(run, rounds=1, iterations=1)
+    benchmark.extra_info['rows_per_day'] = taps[-1].rows
+    benchmark.extra_info['attribute_bytes_per_day'] = taps[-1].attribute_bytes
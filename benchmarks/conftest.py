@@ -0,0 +1,37 @@
+"""Fixtures for the benchmark suite: a stubbed hass and pools on one event loop.
+
+Home Assistant is only required by the modules that import it; bench_calculation.py runs without it.
+"""
+import asyncio
+import pathlib
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def make_fleet(loop):
+    pytest.importorskip("homeassistant")
+    from fleet import Fleet
+
+    fleets = []
+
+    def _make(size):
+        fleet = Fleet(loop, size)
+        fleets.append(fleet)
+        return fleet
+
+    yield _make
+    for fleet in fleets:
+        fleet.close()
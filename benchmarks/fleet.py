@@ -0,0 +1,55 @@
+"""Benchmark pools: controllers on a stubbed hass sharing one virtual scheduler; needs Home Assistant."""
+from datetime import datetime
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.swimming_pool_manager.const import DATA_SCHEDULER, DATA_COMMAND_BUS, DATA_PLAN_EXECUTOR
+from custom_components.swimming_pool_manager.controller import PoolController
+from custom_components.swimming_pool_manager.simulation import InlinePlanExecutor, SimHass, SimCommandBus, SimStore, VirtualScheduler
+
+START = dt_util.as_utc(datetime(2025, 7, 1, 9, 0))
+
+
+class BenchController(PoolController):
+    def _create_store(self):
+        return SimStore()
+
+
+class Fleet:
+    """N controllers sharing one stubbed hass, scheduler and command bus."""
+
+    def __init__(self, loop, size):
+        self.loop = loop
+        self.hass, self.scheduler, self.controllers = loop.run_until_complete(self._build(size))
+
+    async def _build(self, size):
+        hass = SimHass()
+        scheduler = hass.data[DATA_SCHEDULER] = VirtualScheduler(hass, START)
+        hass.data[DATA_COMMAND_BUS] = SimCommandBus(hass, scheduler)
+        hass.data[DATA_PLAN_EXECUTOR] = InlinePlanExecutor()
+        controllers = []
+        for i in range(size):
+            water, outdoor, pump = f"sensor.water_{i}", f"sensor.outdoor_{i}", f"switch.pump_{i}"
+            hass.states.async_set(water, 20.0 + (i % 80) / 10)
+            hass.states.async_set(outdoor, 18.0)
+            hass.states.async_set(pump, 'off')
+            controllers.append(BenchController(hass, {
+                'water_temp_sensor': water,
+                'outdoor_temp_entity': outdoor,
+                'pump_switch': pump,
+                'pivot_hour': '14:00',
+                'pause_minutes': 30,
+                'adjust_coeff_pct': 100,
+                'no_frost_temperature': 0.0,
+            }, f"entry_{i}"))
+        return hass, scheduler, controllers
+
+    def run(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def close(self):
+        async def _shutdown():
+            for controller in self.controllers:
+                await controller.shutdown()
+            await self.hass.async_block_till_done()
+        self.run(_shutdown())
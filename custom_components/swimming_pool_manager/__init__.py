@@ -1,40 +1,88 @@
 """Swimming Pool Manager integration init."""
+import asyncio
 import logging
-from homeassistant.core import HomeAssistant
+from time import perf_counter
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
-from .const import DOMAIN
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import Store
+from .const import DOMAIN, PLATFORMS, DATA_SCHEDULER, DATA_COMMAND_BUS, DATA_PLAN_EXECUTOR, DATA_PENDING_START, DATA_STORES, STORAGE_VERSION, STORAGE_KEY
 from .controller import PoolController
+from .services import async_setup_services, async_unload_services
 
 LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     LOGGER.info("Setting up Swimming Pool Manager entry %s", entry.entry_id)
+    started = perf_counter()
 
     hass.data.setdefault(DOMAIN, {})
     controller = PoolController(hass, entry.data, entry.entry_id)
     hass.data[DOMAIN][entry.entry_id] = controller
+    # entities come up with the cached plan; sensors are not needed for it
+    await controller.async_restore()
 
-    await controller.initialize()
+    # all platforms in one concurrent batch; the first plan waits for startup
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    _async_defer_initial_plan(hass, controller)
 
-    # forward platforms
-    for platform in ["sensor","switch","binary_sensor","number","select"]:
-        hass.async_create_task(hass.config_entries.async_forward_entry_setup(entry, platform))
+    controller.metrics.setup_ms = (perf_counter() - started) * 1000.0
+    LOGGER.info("Swimming Pool Manager entry %s set up in %.1f ms", entry.entry_id, controller.metrics.setup_ms)
 
-    async def handle_set_mode(call):
-        mode = call.data.get("mode")
-        await controller.async_set_mode(mode)
-
-    hass.services.async_register(DOMAIN, "set_mode", handle_set_mode)
+    async_setup_services(hass)
 
     return True
 
+@callback
+def _async_defer_initial_plan(hass: HomeAssistant, controller: PoolController) -> None:
+    """Queue the controller for the fleet-wide first plan once Home Assistant has started.
+
+    Entries set up during startup are batched and planned concurrently; an
+    entry added later is planned right away through the same path.
+    """
+    pending = hass.data.get(DATA_PENDING_START)
+    if pending is None:
+        pending = hass.data[DATA_PENDING_START] = []
+        async_at_started(hass, _async_initial_plans)
+    pending.append(controller)
+
+
+async def _async_initial_plans(hass: HomeAssistant) -> None:
+    loaded = hass.data.get(DOMAIN, {})
+    controllers = [c for c in hass.data.pop(DATA_PENDING_START, []) if loaded.get(c.entry_id) is c]
+    started = perf_counter()
+    results = await asyncio.gather(*(c.initialize() for c in controllers), return_exceptions=True)
+    for controller, result in zip(controllers, results):
+        if isinstance(result, Exception):
+            LOGGER.error("Initial plan failed for entry %s: %s", controller.entry_id, result, exc_info=result)
+    LOGGER.info("Initial plans for %d pools computed in %.1f ms", len(controllers), (perf_counter() - started) * 1000.0)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     LOGGER.info("Unloading Swimming Pool Manager entry %s", entry.entry_id)
-    for platform in ["sensor","switch","binary_sensor","number","select"]:
-        await hass.config_entries.async_forward_entry_unload(entry, platform)
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
 
-    hass.services.async_remove(DOMAIN, "set_mode")
     controller = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
     if controller:
         await controller.shutdown()
-    return True
\ No newline at end of file
+    if not hass.data.get(DOMAIN):
+        async_unload_services(hass)
+        scheduler = hass.data.pop(DATA_SCHEDULER, None)
+        if scheduler:
+            scheduler.async_shutdown()
+        bus = hass.data.pop(DATA_COMMAND_BUS, None)
+        if bus:
+            bus.async_shutdown()
+        planner = hass.data.pop(DATA_PLAN_EXECUTOR, None)
+        if planner:
+            planner.async_shutdown()
+    return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # the controller's own Store: a new instance would leave its pending delayed save behind
+    store = hass.data.get(DATA_STORES, {}).pop(entry.entry_id, None)
+    if store is None:
+        store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}")
+    await store.async_remove()
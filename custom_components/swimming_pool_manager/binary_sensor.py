@@ -2,30 +2,41 @@
 import logging
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from .const import DOMAIN
+from .entity import PoolEntity
 
 LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     controller = hass.data.get(DOMAIN, {}).get(entry.entry_id)
-    entities = [FiltrationActiveBinarySensor(controller, entry.entry_id), FrostProtectionBinarySensor(controller, entry.entry_id)]
+    entities = [FiltrationActiveBinarySensor(controller), FrostProtectionBinarySensor(controller)]
     async_add_entities(entities)
 
-class FiltrationActiveBinarySensor(BinarySensorEntity):
-    def __init__(self, controller, entry_id):
-        self.controller = controller
-        self._attr_name = f"Pool Filtration Active {entry_id}"
-        self._attr_unique_id = f"{entry_id}_filtration_active_bs"
+class PoolBinarySensor(PoolEntity, BinarySensorEntity):
+    _label = None
+    _suffix = None
 
     @property
-    def is_on(self):
-        return bool(self.controller.data.get('filtration_active'))
+    def name(self):
+        return f"Pool {self._label} {self.controller.entry_id}"
 
-class FrostProtectionBinarySensor(BinarySensorEntity):
-    def __init__(self, controller, entry_id):
-        self.controller = controller
-        self._attr_name = f"Pool Frost Protection {entry_id}"
-        self._attr_unique_id = f"{entry_id}_frost_bs"
+    @property
+    def unique_id(self):
+        return f"{self.controller.entry_id}_{self._suffix}"
 
     @property
     def is_on(self):
-        return self.controller.data.get('mode') == 'frost'
\ No newline at end of file
+        return self._value
+
+class FiltrationActiveBinarySensor(PoolBinarySensor):
+    _label = "Filtration Active"
+    _suffix = "filtration_active_bs"
+
+    def _extract(self, data):
+        return bool(data.get('filtration_active'))
+
+class FrostProtectionBinarySensor(PoolBinarySensor):
+    _label = "Frost Protection"
+    _suffix = "frost_bs"
+
+    def _extract(self, data):
+        return data.get('mode') == 'frost'
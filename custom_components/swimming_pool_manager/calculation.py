@@ -1,6 +1,9 @@
 """Cubic polynomial algorithm and schedule helpers."""
 import logging
-from datetime import datetime, timedelta
+from array import array
+from collections.abc import Mapping
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -9,46 +12,217 @@ _BASE_A = 0.00335
 _BASE_B = -0.14953
 _BASE_C = 2.43489
 _BASE_D = -10.72859
+BASE_COEFFS = (_BASE_A, _BASE_B, _BASE_C, _BASE_D)
 
 MIN_HOURS = 0.0
 MAX_HOURS = 24.0
 
 
-def compute_filtration_duration_cubic(temp_celsius: float, coef_pct: float) -> float:
+def _base_curve(t: float, coeffs=None) -> float:
+    # Horner form of the unscaled cubic; the coefficient scale factors out
+    a, b, c, d = coeffs or BASE_COEFFS
+    return ((a * t + b) * t + c) * t + d
+
+
+def compute_filtration_duration_cubic(temp_celsius, coef_pct: float, stat: str = 'mean', coeffs=None) -> float:
+    """Hours for a reading, or for the ``stat`` of a TemperatureHistory aggregates mapping.
+
+    ``coeffs`` are calibrated (a, b, c, d) replacing the base curve.
+    """
+    if isinstance(temp_celsius, Mapping):
+        temp_celsius = temp_celsius.get(stat)
+        if temp_celsius is None:
+            return MIN_HOURS
     try:
-        t = float(temp_celsius)
-        scale = float(coef_pct) / 100.0
-        a = _BASE_A * scale
-        b = _BASE_B * scale
-        c = _BASE_C * scale
-        d = _BASE_D * scale
-
-        hours = (a * (t ** 3)) + (b * (t ** 2)) + (c * t) + d
-        hours_clamped = max(MIN_HOURS, min(MAX_HOURS, float(hours)))
-        LOGGER.debug("Cubic calc: T=%.2f coef=%s -> raw=%.3f clamped=%.3f", t, coef_pct, hours, hours_clamped)
-        return hours_clamped
+        hours = float(coef_pct) / 100.0 * _base_curve(float(temp_celsius), coeffs)
+        if hours != hours:
+            return MIN_HOURS
+        return max(MIN_HOURS, min(MAX_HOURS, hours))
     except Exception:
         LOGGER.exception("Error computing cubic filtration duration")
         return MIN_HOURS
 
 
-def compute_schedule_windows(pivot_time_str: str, pause_minutes: int, total_hours: float):
-    pivot_today = datetime.combine(datetime.now().date(), datetime.strptime(pivot_time_str, "%H:%M").time())
-    half_td = timedelta(hours=total_hours / 2.0)
-    pause_td = timedelta(minutes=int(pause_minutes))
+def compute_filtration_duration_batch(temps, coef_pcts=100.0, coeffs=None):
+    """Vectorized compute_filtration_duration_cubic over arrays of temperatures
+    and coefficients (broadcast against each other); returns a NumPy array."""
+    import numpy as np
+
+    a, b, c, d = coeffs or BASE_COEFFS
+    t = np.asarray(temps, dtype=np.float64)
+    scale = np.asarray(coef_pcts, dtype=np.float64) / 100.0
+    hours = scale * (((a * t + b) * t + c) * t + d)
+    return np.clip(np.nan_to_num(hours, nan=MIN_HOURS), MIN_HOURS, MAX_HOURS)
+
+
+class FiltrationCurveTable:
+    """Precomputed base curve at 0.1 °C resolution with linear interpolation.
+
+    Temperatures outside the table fall back to the exact polynomial. The
+    interpolation error stays below 0.001 h over the default range.
+    """
+
+    def __init__(self, t_min: float = -10.0, t_max: float = 45.0, step: float = 0.1, coeffs=None):
+        self.t_min = t_min
+        self.step = step
+        self.coeffs = coeffs
+        self._inv_step = 1.0 / step
+        count = int(round((t_max - t_min) / step)) + 1
+        self._values = array('d', (_base_curve(t_min + i * step, coeffs) for i in range(count)))
+        self._slopes = array('d', (self._values[i + 1] - self._values[i] for i in range(count - 1)))
+        self._last = count - 1
+
+    def lookup(self, temp_celsius: float, coef_pct: float) -> float:
+        pos = (temp_celsius - self.t_min) * self._inv_step
+        if 0.0 <= pos < self._last:
+            i = int(pos)
+            hours = coef_pct * 0.01 * (self._values[i] + self._slopes[i] * (pos - i))
+            return MIN_HOURS if hours < MIN_HOURS else MAX_HOURS if hours > MAX_HOURS else hours
+        return compute_filtration_duration_cubic(temp_celsius, coef_pct, coeffs=self.coeffs)
+
+
+def fit_filtration_curve(temps, pump_on, samples_per_day: int = 1440, coef_pct: float = 100.0, min_coverage: float = 0.9):
+    """Least-squares cubic through daily (mean water temperature, runtime hours) points.
+
+    ``temps`` and ``pump_on`` are aligned regular samples starting at a day
+    boundary, NaN where unknown. Days covered below ``min_coverage`` are
+    dropped and runtimes are divided by the ``coef_pct`` scale they ran with.
+    Returns ((a, b, c, d), days used, rmse in hours).
+    """
+    import numpy as np
+
+    t = np.asarray(temps, dtype=np.float64)
+    on = np.asarray(pump_on, dtype=np.float64)
+    days = min(t.size, on.size) // samples_per_day
+    t = t[:days * samples_per_day].reshape(days, samples_per_day)
+    on = on[:days * samples_per_day].reshape(days, samples_per_day)
+    valid = ~(np.isnan(t) | np.isnan(on))
+    counts = valid.sum(axis=1)
+    keep = counts >= min_coverage * samples_per_day
+    if keep.sum() < 4:
+        raise ValueError(f"Only {int(keep.sum())} usable days, at least 4 are needed")
+    counts = counts[keep]
+    x = np.where(valid, t, 0.0)[keep].sum(axis=1) / counts
+    y = np.where(valid, on, 0.0)[keep].sum(axis=1) / counts * 24.0 / (float(coef_pct) / 100.0)
+    design = np.vander(x, 4)
+    coeffs, *_ = np.linalg.lstsq(design, y, rcond=None)
+    rmse = float(np.sqrt(np.mean((design @ coeffs - y) ** 2)))
+    return tuple(float(c) for c in coeffs), int(x.size), rmse
+
+
+class ScheduleWindow:
+    """Immutable filtration window held as epoch seconds; datetimes and ISO forms are derived once, on first use.
+
+    Naive edges (tz None) are local wall times and come back naive.
+    """
+
+    __slots__ = ('start_ts', 'end_ts', 'tz', '_start', '_end', '_start_iso', '_end_iso')
+
+    def __init__(self, start: datetime, end: datetime):
+        object.__setattr__(self, 'start_ts', int(round(start.timestamp())))
+        object.__setattr__(self, 'end_ts', int(round(end.timestamp())))
+        object.__setattr__(self, 'tz', start.tzinfo)
+        for name in ('_start', '_end', '_start_iso', '_end_iso'):
+            object.__setattr__(self, name, None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ScheduleWindow is immutable")
 
-    start1 = pivot_today - half_td - (pause_td / 2)
-    end1 = pivot_today - (pause_td / 2)
-    start2 = pivot_today + (pause_td / 2)
+    def _memo(self, name, value):
+        # windows are shared through the LRU cache, so each edge is rendered once per window, not per render
+        object.__setattr__(self, name, value)
+        return value
+
+    @property
+    def start(self):
+        return self._start or self._memo('_start', datetime.fromtimestamp(self.start_ts, self.tz))
+
+    @property
+    def end(self):
+        return self._end or self._memo('_end', datetime.fromtimestamp(self.end_ts, self.tz))
+
+    @property
+    def start_iso(self):
+        return self._start_iso or self._memo('_start_iso', self.start.isoformat())
+
+    @property
+    def end_iso(self):
+        return self._end_iso or self._memo('_end_iso', self.end.isoformat())
+
+    def __iter__(self):
+        yield self.start
+        yield self.end
+
+    def __eq__(self, other):
+        if not isinstance(other, ScheduleWindow):
+            return NotImplemented
+        return self.start_ts == other.start_ts and self.end_ts == other.end_ts
+
+    def __hash__(self):
+        return hash((self.start_ts, self.end_ts))
+
+    def __repr__(self):
+        return f"ScheduleWindow({self.start_iso}, {self.end_iso})"
+
+
+@lru_cache(maxsize=256)
+def _parse_pivot(pivot_time_str: str) -> time:
+    return datetime.strptime(pivot_time_str, "%H:%M").time()
+
+
+@lru_cache(maxsize=256)
+def _cached_windows(day: date, pivot_time_str: str, pause_minutes: int, duration_minutes: int, tz=None):
+    pivot_today = datetime.combine(day, _parse_pivot(pivot_time_str), tzinfo=tz)
+    if tz is not None:
+        # offsets are applied to the absolute instant so a DST shift between
+        # an edge and the pivot does not move the edge by an hour
+        pivot_today = pivot_today.astimezone(timezone.utc)
+    half_td = timedelta(minutes=duration_minutes / 2.0)
+    half_pause = timedelta(minutes=pause_minutes / 2.0)
+
+    start1 = pivot_today - half_td - half_pause
+    end1 = pivot_today - half_pause
+    start2 = pivot_today + half_pause
     end2 = start2 + half_td
 
-    return [(start1, end1), (start2, end2)]
+    if tz is not None:
+        start1, end1, start2, end2 = (edge.astimezone(tz) for edge in (start1, end1, start2, end2))
+    return (ScheduleWindow(start1, end1), ScheduleWindow(start2, end2))
+
+
+def compute_schedule_windows(pivot_time_str: str, pause_minutes: int, total_hours: float, day: date = None, tz=None):
+    """Two windows split around the pivot of day, shared through an LRU cache.
+
+    With tz the windows are timezone-aware instants in that zone (and may
+    start the day before or end the day after); without it they are naive
+    local times. The duration is bucketed to the minute so nearby
+    temperatures reuse the same tuple of ScheduleWindow objects.
+    """
+    if day is None:
+        day = datetime.now(tz).date()
+    return _cached_windows(day, pivot_time_str, int(pause_minutes), int(round(float(total_hours) * 60)), tz)
+
+
+def merge_intervals(intervals):
+    """Sort and merge overlapping or touching (start, end) pairs; empty ones are dropped."""
+    merged = []
+    for start, end in sorted(i for i in intervals if i[1] > i[0]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
 
 
-def check_frost_protection(outdoor_temp: float, no_frost_temp: float) -> bool:
+def check_frost_protection(outdoor_temp: float, no_frost_temp: float, active: bool = False, hysteresis: float = 0.0) -> bool:
+    """Frost protection engages below the threshold and, once active, only
+    releases above threshold + hysteresis so a sensor hovering on the edge
+    does not toggle the pump."""
     if outdoor_temp is None:
         return False
     try:
-        return float(outdoor_temp) < float(no_frost_temp)
+        limit = float(no_frost_temp) + (float(hysteresis) if active else 0.0)
+        return float(outdoor_temp) < limit
     except Exception:
         return False
@@ -0,0 +1,83 @@
+"""Per-pool calibration of the filtration curve from recorded history."""
+import logging
+import math
+from datetime import datetime, time, timedelta
+from time import perf_counter
+from homeassistant.util import dt as dt_util
+from .calculation import fit_filtration_curve
+from .const import CONF_CALIBRATION, CALIBRATION_SAMPLE_SEC
+
+LOGGER = logging.getLogger(__name__)
+
+_SWITCH_VALUES = {'on': 1.0, 'off': 0.0}
+
+
+def _switch_value(state):
+    return _SWITCH_VALUES[state]
+
+
+def resample_states(states, start_ts: float, count: int, step: int = CALIBRATION_SAMPLE_SEC, parse=float):
+    """Hold each recorded state until the next one, sampled on a regular grid; NaN before the first."""
+    import numpy as np
+
+    times = np.empty(len(states), dtype=np.float64)
+    values = np.empty(len(states), dtype=np.float64)
+    for i, state in enumerate(states):
+        times[i] = state.last_changed.timestamp()
+        try:
+            values[i] = parse(state.state)
+        except (KeyError, TypeError, ValueError):
+            values[i] = math.nan
+    if not len(states):
+        return np.full(count, np.nan)
+    idx = np.searchsorted(times, start_ts + step * np.arange(count, dtype=np.float64), side='right') - 1
+    out = values[np.clip(idx, 0, None)]
+    out[idx < 0] = np.nan
+    return out
+
+
+def _fetch_and_fit(hass, water_entity, pump_entity, start, end, coef_pct, min_coverage):
+    # runs in the recorder executor: both the database reads and the fit stay off the loop
+    from homeassistant.components.recorder import history
+
+    started = perf_counter()
+    series = {}
+    for entity_id in (water_entity, pump_entity):
+        series[entity_id] = history.state_changes_during_period(
+            hass, start, end, entity_id=entity_id, no_attributes=True, include_start_time_state=True,
+        ).get(entity_id, [])
+    fetched = perf_counter()
+    count = int((end - start).total_seconds()) // CALIBRATION_SAMPLE_SEC
+    temps = resample_states(series[water_entity], start.timestamp(), count)
+    pump_on = resample_states(series[pump_entity], start.timestamp(), count, parse=_switch_value)
+    coeffs, days, rmse = fit_filtration_curve(temps, pump_on, 86400 // CALIBRATION_SAMPLE_SEC, coef_pct, min_coverage)
+    return coeffs, days, rmse, (fetched - started) * 1000.0, (perf_counter() - fetched) * 1000.0
+
+
+async def async_calibrate(hass, entry, controller, days: int, min_coverage: float = 0.9) -> dict:
+    """Fit the pool's curve on the last ``days`` full days and store it, versioned, in the config entry."""
+    from homeassistant.components.recorder import get_instance
+
+    end = datetime.combine(dt_util.now().date(), time(0), tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    start = end - timedelta(days=days)
+    coeffs, used, rmse, fetch_ms, fit_ms = await get_instance(hass).async_add_executor_job(
+        _fetch_and_fit, hass,
+        controller.config.get('water_temp_sensor'), controller.config.get('pump_switch'),
+        start, end, int(controller.config.get('adjust_coeff_pct', 100)), min_coverage,
+    )
+    previous = entry.data.get(CONF_CALIBRATION) or {}
+    calibration = {
+        'version': previous.get('version', 0) + 1,
+        'coeffs': list(coeffs),
+        'days': used,
+        'rmse_hours': round(rmse, 4),
+        'period': [start.isoformat(), end.isoformat()],
+        'fitted_at': dt_util.utcnow().isoformat(),
+    }
+    LOGGER.info(
+        "Calibrated %s on %d days (rmse %.3f h): fetch %.0f ms, fit %.0f ms",
+        entry.entry_id, used, rmse, fetch_ms, fit_ms,
+    )
+    hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_CALIBRATION: calibration})
+    await controller.async_set_calibration(calibration)
+    return calibration
@@ -0,0 +1,123 @@
+"""Integration-wide queue for switch commands (pump, robot)."""
+import asyncio
+import logging
+import time
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from .const import DATA_COMMAND_BUS, COMMAND_CONCURRENCY, COMMAND_TIMEOUT_SEC, COMMAND_RETRIES, COMMAND_BACKOFF_SEC
+from .metrics import RingBuffer
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CommandBus:
+    """Fire-and-forget switch commands.
+
+    Each entity keeps only its latest target: a command submitted while a
+    previous one is in flight replaces it, and a target equal to the known
+    state is dropped. Calls are bounded per backend integration by a
+    semaphore, each attempt has a timeout and failures retry with
+    exponential backoff.
+    """
+
+    def __init__(self, hass, concurrency=COMMAND_CONCURRENCY, timeout=COMMAND_TIMEOUT_SEC, retries=COMMAND_RETRIES, backoff=COMMAND_BACKOFF_SEC):
+        self.hass = hass
+        self._concurrency = concurrency
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff = backoff
+        self._target = {}
+        self._known = {}
+        self._workers = {}
+        self._semaphores = {}
+        self.latency = {}
+
+    @callback
+    def async_submit(self, entity_id, on: bool):
+        """Queue a target state for entity_id and return immediately."""
+        if not entity_id:
+            return
+        self._target[entity_id] = on
+        if entity_id in self._workers:
+            # the running worker picks up the newest target
+            return
+        if self._known_state(entity_id) == on:
+            LOGGER.debug("Dropping redundant %s for %s", 'turn_on' if on else 'turn_off', entity_id)
+            return
+        # the live state differs from what we last sent (toggled outside, or
+        # failed over): forget it so the worker does not drop the command
+        self._known.pop(entity_id, None)
+        self._workers[entity_id] = self.hass.async_create_background_task(
+            self._async_drain(entity_id), f"swimming_pool_manager command {entity_id}"
+        )
+
+    def _known_state(self, entity_id):
+        state = self.hass.states.get(entity_id)
+        if state is not None and state.state in ('on', 'off'):
+            return state.state == 'on'
+        return self._known.get(entity_id)
+
+    def _backend(self, entity_id):
+        entry = er.async_get(self.hass).async_get(entity_id)
+        return entry.platform if entry else entity_id.split('.', 1)[0]
+
+    async def _async_drain(self, entity_id):
+        try:
+            while True:
+                target = self._target[entity_id]
+                if self._known.get(entity_id) == target:
+                    return
+                sent = await self._async_send(entity_id, target)
+                if sent is None:
+                    continue
+                if not sent:
+                    self._known.pop(entity_id, None)
+                    return
+                self._known[entity_id] = target
+        finally:
+            self._workers.pop(entity_id, None)
+
+    async def _async_send(self, entity_id, on: bool):
+        service = 'turn_on' if on else 'turn_off'
+        backend = self._backend(entity_id)
+        semaphore = self._semaphores.get(backend)
+        if semaphore is None:
+            semaphore = self._semaphores[backend] = asyncio.Semaphore(self._concurrency)
+        for attempt in range(self._retries):
+            try:
+                async with semaphore:
+                    started = time.perf_counter()
+                    async with asyncio.timeout(self._timeout):
+                        await self.hass.services.async_call('switch', service, {'entity_id': entity_id}, blocking=True)
+                    self.latency.setdefault(entity_id, RingBuffer()).append((time.perf_counter() - started) * 1000.0)
+                return True
+            except (TimeoutError, HomeAssistantError) as err:
+                LOGGER.warning("%s %s failed (attempt %d/%d): %s", service, entity_id, attempt + 1, self._retries, err)
+            if attempt + 1 < self._retries:
+                await asyncio.sleep(self._backoff * (2 ** attempt))
+                if self._target.get(entity_id) != on:
+                    # superseded while backing off; let the drain loop send the new target
+                    return None
+        LOGGER.error("Giving up %s %s after %d attempts", service, entity_id, self._retries)
+        return False
+
+    def latency_summary(self, entity_id):
+        """Service-call latency percentiles (ms) for entity_id."""
+        return self.latency.get(entity_id, RingBuffer()).summary()
+
+    @callback
+    def async_shutdown(self):
+        for task in list(self._workers.values()):
+            task.cancel()
+        self._workers.clear()
+        self._target.clear()
+        self._known.clear()
+
+
+@callback
+def async_get_command_bus(hass):
+    bus = hass.data.get(DATA_COMMAND_BUS)
+    if bus is None:
+        bus = hass.data[DATA_COMMAND_BUS] = CommandBus(hass)
+    return bus
@@ -4,7 +4,10 @@ import logging
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.helpers.selector import EntitySelector, EntitySelectorConfig
-from .const import DOMAIN, CONF_WATER_TEMP, CONF_PUMP_SWITCH, CONF_PIVOT_HOUR, CONF_PAUSE_MINUTES, CONF_CUT_DURATION_MIN, CONF_ANTI_FREEZE_TEMP, CONF_ROBOT_ENABLED, CONF_ROBOT_SWITCH, CONF_ADJUST_COEFF, CONF_OUTDOOR_TEMP, CONF_NO_FROST_TEMP
+from .const import DOMAIN, CONF_WATER_TEMP, CONF_PUMP_SWITCH, CONF_PIVOT_HOUR, CONF_PAUSE_MINUTES, CONF_CUT_DURATION_MIN, CONF_ROBOT_ENABLED, CONF_ROBOT_SWITCH, CONF_ADJUST_COEFF, CONF_OUTDOOR_TEMP, CONF_NO_FROST_TEMP, CONF_TEMP_DEBOUNCE_SEC, CONF_TEMP_HYSTERESIS, CONF_TEMP_AVERAGE_MINUTES, DEFAULT_TEMP_DEBOUNCE_SEC, DEFAULT_TEMP_HYSTERESIS, DEFAULT_TEMP_AVERAGE_MINUTES
+from .const import CONF_FORECAST_ENTITY, CONF_FORECAST_FILE, CONF_FORECAST_DAYS, DEFAULT_FORECAST_DAYS
+from .const import CONF_ROBOT_LEAD_MINUTES, CONF_ROBOT_DURATION_MINUTES, DEFAULT_ROBOT_LEAD_MINUTES, DEFAULT_ROBOT_DURATION_MINUTES
+from .const import CONF_TARIFF_ENTITY, CONF_TARIFF_FILE, CONF_TARIFF_SOLAR, CONF_MIN_RUN_MINUTES, CONF_MAX_PAUSE_MINUTES, DEFAULT_MIN_RUN_MINUTES, DEFAULT_MAX_PAUSE_MINUTES
 
 LOGGER = logging.getLogger(__name__)
 
@@ -37,6 +40,17 @@ class swimming_pool_managerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Optional(CONF_ROBOT_ENABLED, default=False): bool,
             vol.Optional(CONF_ADJUST_COEFF, default=100): vol.All(int, vol.Range(min=10, max=100)),
             vol.Required(CONF_NO_FROST_TEMP, default=0.0): float,
+            vol.Optional(CONF_TEMP_DEBOUNCE_SEC, default=DEFAULT_TEMP_DEBOUNCE_SEC): vol.All(int, vol.Range(min=0, max=3600)),
+            vol.Optional(CONF_TEMP_HYSTERESIS, default=DEFAULT_TEMP_HYSTERESIS): vol.All(float, vol.Range(min=0.0, max=5.0)),
+            vol.Optional(CONF_TEMP_AVERAGE_MINUTES, default=DEFAULT_TEMP_AVERAGE_MINUTES): vol.All(int, vol.Range(min=1, max=1440)),
+            vol.Optional(CONF_TARIFF_ENTITY): EntitySelector(EntitySelectorConfig(domain=["sensor"])),
+            vol.Optional(CONF_TARIFF_FILE): str,
+            vol.Optional(CONF_TARIFF_SOLAR, default=False): bool,
+            vol.Optional(CONF_MIN_RUN_MINUTES, default=DEFAULT_MIN_RUN_MINUTES): vol.All(int, vol.Range(min=15, max=1440)),
+            vol.Optional(CONF_MAX_PAUSE_MINUTES, default=DEFAULT_MAX_PAUSE_MINUTES): vol.All(int, vol.Range(min=15, max=1440)),
+            vol.Optional(CONF_FORECAST_ENTITY): EntitySelector(EntitySelectorConfig(domain=["weather"])),
+            vol.Optional(CONF_FORECAST_FILE): str,
+            vol.Optional(CONF_FORECAST_DAYS, default=DEFAULT_FORECAST_DAYS): vol.All(int, vol.Range(min=1, max=7)),
         })
 
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
@@ -49,6 +63,8 @@ class swimming_pool_managerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         schema = vol.Schema({
             vol.Required(CONF_ROBOT_SWITCH): EntitySelector(EntitySelectorConfig(domain=["switch"])),
+            vol.Optional(CONF_ROBOT_LEAD_MINUTES, default=DEFAULT_ROBOT_LEAD_MINUTES): vol.All(int, vol.Range(min=0, max=720)),
+            vol.Optional(CONF_ROBOT_DURATION_MINUTES, default=DEFAULT_ROBOT_DURATION_MINUTES): vol.All(int, vol.Range(min=5, max=1440)),
         })
 
         return self.async_show_form(step_id="robot", data_schema=schema, errors=errors)
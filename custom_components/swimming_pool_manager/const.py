@@ -10,4 +10,61 @@ CONF_ROBOT_ENABLED = "robot_enabled"
 CONF_ROBOT_SWITCH = "robot_switch"
 CONF_ADJUST_COEFF = "adjust_coeff_pct"
 
-PLATFORMS = ["sensor","switch","binary_sensor","number","select"]
\ No newline at end of file
+PLATFORMS = ["sensor","switch","binary_sensor","number","select"]
+CONF_TEMP_DEBOUNCE_SEC = "temp_debounce_seconds"
+CONF_TEMP_HYSTERESIS = "temp_hysteresis"
+DEFAULT_TEMP_DEBOUNCE_SEC = 10
+DEFAULT_TEMP_HYSTERESIS = 0.5
+
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
+DATA_COMMAND_BUS = f"{DOMAIN}_command_bus"
+COMMAND_CONCURRENCY = 4
+COMMAND_TIMEOUT_SEC = 10
+COMMAND_RETRIES = 3
+COMMAND_BACKOFF_SEC = 2.0
+
+DATA_PENDING_START = f"{DOMAIN}_pending_start"
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.plan"
+PLAN_SAVE_DELAY_SEC = 30
+
+CONF_TEMP_AVERAGE_MINUTES = "temp_average_minutes"
+DEFAULT_TEMP_AVERAGE_MINUTES = 60
+
+CONF_CALIBRATION = "calibration"
+CALIBRATION_SAMPLE_SEC = 60
+CALIBRATION_DEFAULT_DAYS = 365
+
+MODES = ["ete", "hiver", "continu", "off"]
+PROFILE_BACKENDS = ["cprofile", "yappi"]
+FLEET_CONCURRENCY = 16
+
+# frost watchdog re-check interval: FROST_CHECK_SEC_PER_DEGREE per °C away from the threshold, clamped
+FROST_CHECK_MIN_SEC = 60
+FROST_CHECK_MAX_SEC = 3 * 3600
+FROST_CHECK_SEC_PER_DEGREE = 900
+
+CONF_TARIFF_ENTITY = "tariff_entity"
+CONF_TARIFF_FILE = "tariff_file"
+CONF_TARIFF_SOLAR = "tariff_solar"
+CONF_MIN_RUN_MINUTES = "min_run_minutes"
+CONF_MAX_PAUSE_MINUTES = "max_pause_minutes"
+DEFAULT_MIN_RUN_MINUTES = 60
+DEFAULT_MAX_PAUSE_MINUTES = 240
+
+CONF_ROBOT_LEAD_MINUTES = "robot_lead_minutes"
+CONF_ROBOT_DURATION_MINUTES = "robot_duration_minutes"
+DEFAULT_ROBOT_LEAD_MINUTES = 30
+DEFAULT_ROBOT_DURATION_MINUTES = 120
+
+DATA_PLAN_EXECUTOR = f"{DOMAIN}_plan_executor"
+DATA_PROFILER = f"{DOMAIN}_profiler"
+DATA_STORES = f"{DOMAIN}_stores"
+PLAN_WORKERS = 2
+
+CONF_FORECAST_ENTITY = "forecast_entity"
+CONF_FORECAST_FILE = "forecast_file"
+CONF_FORECAST_DAYS = "forecast_days"
+DEFAULT_FORECAST_DAYS = 3
@@ -1,57 +1,411 @@
 """Controller that coordinates schedule, frost protection and updates."""
 import logging
-from datetime import datetime
-from homeassistant.helpers.event import async_track_time_change, async_call_later
-from .calculation import compute_filtration_duration_cubic, compute_schedule_windows, check_frost_protection
-from .const import DOMAIN
+from time import perf_counter
+from datetime import date, datetime, time, timedelta
+from functools import partial
+from homeassistant.core import callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from .calculation import compute_schedule_windows, check_frost_protection, FiltrationCurveTable
+from .const import DOMAIN, DATA_PROFILER, DATA_STORES, CONF_TEMP_DEBOUNCE_SEC, CONF_TEMP_HYSTERESIS, CONF_TEMP_AVERAGE_MINUTES, CONF_CALIBRATION, DEFAULT_TEMP_DEBOUNCE_SEC, DEFAULT_TEMP_HYSTERESIS, DEFAULT_TEMP_AVERAGE_MINUTES, STORAGE_VERSION, STORAGE_KEY, PLAN_SAVE_DELAY_SEC, FROST_CHECK_MIN_SEC, FROST_CHECK_MAX_SEC, FROST_CHECK_SEC_PER_DEGREE
+from .const import CONF_FORECAST_ENTITY, CONF_FORECAST_FILE, CONF_FORECAST_DAYS, DEFAULT_FORECAST_DAYS
+from .const import CONF_ROBOT_LEAD_MINUTES, CONF_ROBOT_DURATION_MINUTES, DEFAULT_ROBOT_LEAD_MINUTES, DEFAULT_ROBOT_DURATION_MINUTES
+from .const import CONF_TARIFF_ENTITY, CONF_TARIFF_FILE, CONF_TARIFF_SOLAR, CONF_MIN_RUN_MINUTES, CONF_MAX_PAUSE_MINUTES, DEFAULT_MIN_RUN_MINUTES, DEFAULT_MAX_PAUSE_MINUTES
+from .command_bus import async_get_command_bus
+from .coordinator import PoolCoordinator
+from .forecast import ForecastDay, async_fetch_forecast, daily_means, load_forecast_file, water_outlook
+from .history import TemperatureHistory, HISTORY_HORIZON_SEC
+from .ledger import RuntimeLedger
+from .metrics import PoolMetrics, async_get_pivot_profiler
+from .optimizer import attribute_points, load_tariff_profile
+from .planner import CancelToken, PlanInputs, async_get_plan_executor, compute_plan
+from .scheduler import async_get_scheduler
+from .state import PoolConfig, PoolState
 
 LOGGER = logging.getLogger(__name__)
 
+# interpolated curve for the per-sensor-event check; plans use the exact polynomial
+_CURVE = FiltrationCurveTable()
+
 class PoolController:
     def __init__(self, hass, config: dict, entry_id: str):
         self.hass = hass
         self.entry_id = entry_id
-        self.config = config
+        self.config = PoolConfig(config)
         self.mode = 'ete'
-        self._scheduled = []
-        self.data = { 'filtration_active': False, 'mode': None }
+        self._scheduler = async_get_scheduler(hass)
+        self._commands = async_get_command_bus(hass)
+        self._planner = async_get_plan_executor(hass)
+        self._timers = {}
+        self._unsubs = []
+        self._pivot_handle = None
+        self._frost_handle = None
+        self._robot_handle = None
+        self._robot_since = None
+        self._robot_day = None
+        self._robot_used = 0.0
+        # end of the winter cut that already ran since the last pivot
+        self._hiver_done = None
+        self._plan_temp = None
+        self._last_temps = (None, None)
+        self._intervals = []
+        self._cache = {}
+        self._store = self._create_store()
+        self._save_pending = False
+        self._profiler = None
+        self._sensor_diagnostics = None
+        # 'plan' feeds the filtration curve, 'day' is the daily min/mean/max
+        windows = {'plan': 60 * int(self.config.get(CONF_TEMP_AVERAGE_MINUTES, DEFAULT_TEMP_AVERAGE_MINUTES)), 'day': HISTORY_HORIZON_SEC}
+        self.history = {
+            'water': TemperatureHistory(windows, horizon=HISTORY_HORIZON_SEC),
+            'outdoor': TemperatureHistory(windows, horizon=HISTORY_HORIZON_SEC),
+        }
+        self._coeffs = None
+        self._curve = _CURVE
+        self._tariff_profile = None
+        self._tariff_points = (None, [])
+        self._tariff_masks = {}
+        self._plan_token = None
+        self._air_forecast = []
+        self._horizon = {}
+        self._apply_calibration(self.config.get(CONF_CALIBRATION))
+        self.metrics = PoolMetrics()
+        self.ledger = RuntimeLedger()
+        self.data = PoolState()
+        self.coordinator = PoolCoordinator(hass, self)
+        self._temp_debouncer = Debouncer(
+            hass,
+            LOGGER,
+            cooldown=float(self.config.get(CONF_TEMP_DEBOUNCE_SEC, DEFAULT_TEMP_DEBOUNCE_SEC)),
+            immediate=True,
+            function=self._async_evaluate_temperatures,
+        )
+
+    def _create_store(self):
+        # kept per entry across reloads so removing the entry goes through the instance that saves
+        stores = self.hass.data.setdefault(DATA_STORES, {})
+        store = stores.get(self.entry_id)
+        if store is None:
+            store = stores[self.entry_id] = Store(self.hass, STORAGE_VERSION, f"{STORAGE_KEY}.{self.entry_id}")
+        return store
+
+    async def async_restore(self):
+        """Load the persisted plan so entities and the first plan start from it."""
+        cache = await self._store.async_load()
+        if not cache:
+            return
+        self._cache = cache
+        self.mode = cache.get('mode', self.mode)
+        self._last_temps = tuple(cache.get('temps') or (None, None))
+        plan = cache.get('plan') or {}
+        self.data.update(plan)
+        hours = plan.get('filtration_hours')
+        self.data.schedule_windows = () if hours is None else compute_schedule_windows(
+            plan.get('pivot_hour'), plan.get('pause_minutes', 0), hours,
+            day=dt_util.as_local(self._now()).date(), tz=dt_util.DEFAULT_TIME_ZONE,
+        )
+        self.ledger = RuntimeLedger.from_list(cache.get('ledger'))
+        if self.ledger.on_since is not None:
+            pump = self.hass.states.get(self.config.get('pump_switch'))
+            if pump is not None and pump.state == 'on':
+                # still running across the restart: keep counting the same run
+                self.data.filtration_active = True
+            else:
+                saved = dt_util.parse_datetime(cache.get('saved_at') or '')
+                self.ledger.off(saved.timestamp() if saved else self.ledger.on_since)
+        self._restore_robot(cache.get('robot'))
+        # the selected mode is kept; only a winter cut-off that already passed is dropped
+        done = cache.get('hiver_done')
+        until = cache.get('hiver_until')
+        if until is not None and until <= self._now().timestamp():
+            self._cache.pop('hiver_until')
+            done = until
+        if self.mode == 'hiver' and done is not None and done >= self._last_pivot_ts():
+            # the cut already ran since the last pivot: do not start another on startup
+            self._hiver_done = done
+        LOGGER.info("PoolController(%s) restored plan saved at %s", self.entry_id, cache.get('saved_at'))
+        self._publish()
+
+    def _restore_robot(self, saved):
+        """Take over a robot left running by the previous instance, so the pump still stops it."""
+        since, day, used = saved or (None, None, 0)
+        if day is not None:
+            self._robot_day, self._robot_used = date.fromordinal(day), float(used)
+        robot = self._robot_switch()
+        state = self.hass.states.get(robot) if robot else None
+        if state is None or state.state != 'on':
+            return
+        now = self._now().timestamp()
+        self.data.robot_active = True
+        # switched on outside a saved run (or before robot state was saved): count it from now
+        self._robot_since = since if since is not None else now
+        if not self.data.filtration_active:
+            self._stop_robot()
+            return
+        left = self._robot_budget() - (now - self._robot_since)
+        self._robot_handle = self._scheduler.async_schedule_in(max(0.0, left), self._stop_robot)
+
+    def _cache_payload(self):
+        self._save_pending = False
+        hiver = [key[1] for key in self._timers if key[0] == 'hiver']
+        return {
+            'saved_at': self._now().isoformat(),
+            'mode': self.mode,
+            'temps': list(self._last_temps),
+            'plan': {key: self.data.get(key) for key in ('mode', 'pivot_hour', 'pause_minutes', 'adjust_coeff_pct', 'filtration_hours')},
+            'intervals': [list(interval) for interval in self._intervals],
+            'hiver_until': hiver[0] if hiver else None,
+            'hiver_done': self._hiver_done,
+            'ledger': self.ledger.as_list(),
+            'robot': [
+                self._robot_since if self.data.robot_active else None,
+                self._robot_day.toordinal() if self._robot_day else None,
+                round(self._robot_used),
+            ],
+        }
+
+    def _schedule_save(self):
+        # coalesced: a burst of recomputes ends up as a single write
+        self._save_pending = True
+        self._store.async_delay_save(self._cache_payload, PLAN_SAVE_DELAY_SEC)
 
     async def initialize(self):
-        pivot = self.config.get('pivot_hour')
-        if pivot:
-            h, m = pivot.split(':') if ':' in pivot else (pivot, '00')
-            async_track_time_change(self.hass, self._handle_pivot, hour=int(h), minute=int(m), second=0)
-        LOGGER.info("PoolController(%s) initialized", self.entry_id)
-        await self._handle_pivot(datetime.now())
+        path = self.config.get(CONF_TARIFF_FILE)
+        if path:
+            try:
+                self._tariff_profile = await self.hass.async_add_executor_job(load_tariff_profile, path)
+            except (OSError, ValueError) as err:
+                LOGGER.error("PoolController(%s) cannot read tariff file %s: %s", self.entry_id, path, err)
+        path = self.config.get(CONF_FORECAST_FILE)
+        if path:
+            try:
+                self._air_forecast = await self.hass.async_add_executor_job(load_forecast_file, path)
+            except (OSError, ValueError) as err:
+                LOGGER.error("PoolController(%s) cannot read forecast file %s: %s", self.entry_id, path, err)
+        await self._async_refresh_forecast()
+        self._track_pivot()
+        self._track_sensors()
+        for key, entity_id in (('water', self.config.get('water_temp_sensor')), ('outdoor', self.config.get('outdoor_temp_entity'))):
+            self._record(key, self.hass.states.get(entity_id))
+        started = perf_counter()
+        await self._handle_pivot(self._now())
+        self._arm_frost_watchdog(self._last_temps[1])
+        self.metrics.first_plan_ms = (perf_counter() - started) * 1000.0
+        LOGGER.info("PoolController(%s) initialized, first plan in %.1f ms", self.entry_id, self.metrics.first_plan_ms)
 
     async def shutdown(self):
-        for cancel in self._scheduled:
-            try:
-                cancel()
-            except Exception:
-                pass
-        self._scheduled.clear()
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        if self._pivot_handle:
+            self._pivot_handle.cancel()
+            self._pivot_handle = None
+        if self._frost_handle:
+            self._frost_handle.cancel()
+            self._frost_handle = None
+        if self._robot_handle:
+            self._robot_handle.cancel()
+            self._robot_handle = None
+        if self._profiler:
+            self._profiler.pools.discard(self.entry_id)
+            if not self._profiler.pools:
+                self.hass.data.pop(DATA_PROFILER, None)
+            self._profiler = None
+        self._temp_debouncer.async_cancel()
+        if self._save_pending:
+            # write the delayed save now (before the timers go, the cut-off is read from them);
+            # this also cancels its delay timer, so nothing is written after an unload or removal
+            await self._store.async_save(self._cache_payload())
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+
+    def _now(self):
+        # the scheduler is the single clock, so a simulated one drives everything
+        return self._scheduler.now()
+
+    def _track_sensors(self):
+        sensors = [e for e in (self.config.get('water_temp_sensor'), self.config.get('outdoor_temp_entity')) if e]
+        if sensors:
+            self._unsubs.append(async_track_state_change_event(self.hass, sensors, self._handle_temp_event))
+
+    def _pivot_time(self):
+        pivot = self.config.get('pivot_hour')
+        if not pivot:
+            return None
+        h, m = pivot.split(':') if ':' in pivot else (pivot, '00')
+        return time(int(h), int(m))
+
+    def _last_pivot_ts(self):
+        at = self._pivot_time()
+        if at is None:
+            return float('-inf')
+        local_now = dt_util.as_local(self._now())
+        when = datetime.combine(local_now.date(), at, tzinfo=local_now.tzinfo)
+        if when > local_now:
+            when = datetime.combine(local_now.date() - timedelta(days=1), at, tzinfo=local_now.tzinfo)
+        return when.timestamp()
+
+    def _track_pivot(self):
+        if self._pivot_handle:
+            self._pivot_handle.cancel()
+            self._pivot_handle = None
+        at = self._pivot_time()
+        if at is None:
+            return
+        local_now = dt_util.as_local(self._now())
+        when = datetime.combine(local_now.date(), at, tzinfo=local_now.tzinfo)
+        if when <= local_now:
+            when = datetime.combine(local_now.date() + timedelta(days=1), at, tzinfo=local_now.tzinfo)
+        self._pivot_handle = self._scheduler.async_schedule_at(when, self._run_pivot)
+
+    async def _run_pivot(self, now):
+        self._pivot_handle = None
+        self._track_pivot()
+        self._hiver_done = None
+        await self._async_refresh_forecast()
+        await self._handle_pivot(now)
+
+    async def _async_refresh_forecast(self):
+        """Daily air means from the forecast entity; fetched per pivot, not per plan."""
+        entity_id = self.config.get(CONF_FORECAST_ENTITY)
+        if not entity_id:
+            return
+        days = daily_means(await async_fetch_forecast(self.hass, entity_id), dt_util.DEFAULT_TIME_ZONE)
+        if days:
+            self._air_forecast = days
+        else:
+            LOGGER.warning("PoolController(%s) got no forecast from %s, keeping the previous one", self.entry_id, entity_id)
+
+    async def async_snapshot(self):
+        return self.data.copy()
+
+    def _publish(self):
+        # one snapshot per change, fanned out to every entity of this pool
+        now = self._now()
+        self.data.today = dt_util.as_local(now).date()
+        self.data.ledger = self.ledger.snapshot(now.timestamp())
+        self._sensor_diagnostics = None
+        self.coordinator.async_set_updated_data(self.data.copy())
 
     async def async_set_mode(self, mode: str):
         LOGGER.info("Set mode %s", mode)
         self.mode = mode
-        await self._handle_pivot(datetime.now())
+        self._hiver_done = None
+        await self._handle_pivot(self._now())
 
-    def update_config(self, key, value):
+    async def async_recompute(self):
+        await self._async_refresh_forecast()
+        await self._handle_pivot(self._now())
+
+    async def async_update_config(self, key, value):
         LOGGER.info("Update config %s=%s", key, value)
-        self.config[key] = value
+        if self.config.get(key) == value:
+            return
+        self.config = self.config.replace(**{key: value})
+        if key == 'pivot_hour':
+            self._track_pivot()
+        # replan at once; the timer diff keeps this O(changed) and bounce-free
+        await self._handle_pivot(self._now())
 
-    async def _handle_pivot(self, now):
-        LOGGER.debug("Handle pivot at %s", now)
-        # clear previous schedules
-        for c in self._scheduled:
-            try:
-                c()
-            except Exception:
-                pass
-        self._scheduled.clear()
+    def _apply_calibration(self, calibration):
+        coeffs = tuple(calibration['coeffs']) if calibration else None
+        self._coeffs = coeffs
+        self._curve = FiltrationCurveTable(coeffs=coeffs) if coeffs else _CURVE
+
+    async def async_set_calibration(self, calibration):
+        LOGGER.info("PoolController(%s) using calibration v%s", self.entry_id, (calibration or {}).get('version'))
+        self.config = self.config.replace(**{CONF_CALIBRATION: calibration})
+        self._apply_calibration(calibration)
+        await self._handle_pivot(self._now())
+
+    async def async_set_pump(self, on: bool):
+        if on:
+            await self._turn_on_pump()
+        else:
+            await self._turn_off_pump()
+
+    def _record(self, key, state, ts=None):
+        try:
+            value = float(state.state)
+        except (AttributeError, TypeError, ValueError):
+            return
+        self.history[key].add(self._now().timestamp() if ts is None else ts, value)
+
+    def _water_input(self, temp):
+        """Aggregates over the averaging window, or the instantaneous reading while the history is empty."""
+        stats = self.history['water'].aggregates('plan', self._now().timestamp())
+        return stats if stats['count'] else temp
+
+    @callback
+    def _handle_temp_event(self, event):
+        key = 'water' if event.data.get('entity_id') == self.config.get('water_temp_sensor') else 'outdoor'
+        self._record(key, event.data.get('new_state'))
+        # the first change is evaluated at once, bursts within the cooldown collapse into one
+        self.hass.async_create_task(self._temp_debouncer.async_call())
+
+    def _frost_interval(self, outdoor):
+        # close to the threshold check every minute, far from it every few hours
+        if outdoor is None:
+            return FROST_CHECK_MIN_SEC
+        distance = abs(outdoor - float(self.config.get('no_frost_temperature', 0.0)))
+        return min(FROST_CHECK_MAX_SEC, max(FROST_CHECK_MIN_SEC, distance * FROST_CHECK_SEC_PER_DEGREE))
+
+    def _arm_frost_watchdog(self, outdoor):
+        """(Re)arm the next frost check, only ever moving an armed one earlier."""
+        delay = self._frost_interval(outdoor)
+        handle = self._frost_handle
+        if handle is not None:
+            if handle.when <= self._now().timestamp() + delay:
+                return
+            handle.cancel()
+        self._frost_handle = self._scheduler.async_schedule_in(delay, self._run_frost_watchdog)
 
-        # read temps
+    async def _run_frost_watchdog(self, now):
+        self._frost_handle = None
+        self.metrics.frost_checks += 1
+        _, outdoor = self._read_temps()
+        hysteresis = float(self.config.get(CONF_TEMP_HYSTERESIS, DEFAULT_TEMP_HYSTERESIS))
+        frost_active = self.data.mode == 'frost'
+        frost = check_frost_protection(outdoor, self.config.get('no_frost_temperature', 0.0), frost_active, hysteresis)
+        if frost != frost_active:
+            LOGGER.info("Frost watchdog: outdoor temperature %s crossed the frost threshold", outdoor)
+            await self._handle_pivot(now)
+        elif frost:
+            # keep driving the pump; the command bus drops the command while the switch is already on
+            self._commands.async_submit(self.config.get('pump_switch'), True)
+            if not self.data.filtration_active:
+                self._set_filtration(True)
+                self._publish()
+        self._arm_frost_watchdog(outdoor)
+
+    async def _async_evaluate_temperatures(self):
+        temp, outdoor = self._read_temps()
+        self._arm_frost_watchdog(outdoor)
+        hysteresis = float(self.config.get(CONF_TEMP_HYSTERESIS, DEFAULT_TEMP_HYSTERESIS))
+        frost_active = self.data.mode == 'frost'
+        frost = check_frost_protection(outdoor, self.config.get('no_frost_temperature', 0.0), frost_active, hysteresis)
+        if frost != frost_active:
+            LOGGER.info("Outdoor temperature %s crossed the frost threshold", outdoor)
+            await self._handle_pivot(self._now())
+            return
+        if frost or self.mode != 'ete' or temp is None:
+            return
+        water = self._water_input(temp)
+        temp = water['mean'] if isinstance(water, dict) else water
+        if self._plan_temp is not None and abs(temp - self._plan_temp) < hysteresis:
+            return
+        # outside the band: only replan if the schedule itself would change
+        hours = self._curve.lookup(temp, int(self.config.get('adjust_coeff_pct',100)))
+        if self.data.filtration_hours is not None and round(hours * 60) == round(self.data.filtration_hours * 60):
+            self._plan_temp = temp
+            return
+        LOGGER.debug("Water temperature %s changes the plan, recomputing", temp)
+        await self._handle_pivot(self._now())
+
+    def _read_temps(self):
         temp_state = self.hass.states.get(self.config.get('water_temp_sensor'))
         outdoor_state = self.hass.states.get(self.config.get('outdoor_temp_entity'))
         try:
@@ -62,68 +416,372 @@ class PoolController:
             outdoor = float(outdoor_state.state) if outdoor_state else None
         except Exception:
             outdoor = None
+        # fall back to the last valid readings (possibly restored) while a sensor is unavailable
+        last_temp, last_outdoor = self._last_temps
+        self._last_temps = (last_temp if temp is None else temp, last_outdoor if outdoor is None else outdoor)
+        return self._last_temps
+
+    async def _handle_pivot(self, now):
+        LOGGER.debug("Handle pivot at %s", now)
+        profiler = self._profiler
+        profiled = False
+        started = perf_counter()
+        try:
+            if profiler:
+                profiled = profiler.enable()
+            await self._plan()
+        finally:
+            if profiled:
+                profiler.disable()
+            self.metrics.pivot_ms.append((perf_counter() - started) * 1000.0)
+            self.metrics.recomputes += 1
+        self._publish()
+        self._schedule_save()
+
+    async def async_set_profiling(self, enabled: bool, backend: str = 'cprofile'):
+        """Join or leave the integration-wide pivot profile.
+
+        The last pool to leave writes the capture and gets its path; earlier
+        ones get None.
+        """
+        if enabled:
+            if self._profiler is None:
+                self._profiler = async_get_pivot_profiler(self.hass, backend)
+                self._profiler.pools.add(self.entry_id)
+                LOGGER.info("PoolController(%s) pivot profiling started (%s)", self.entry_id, self._profiler.backend)
+            return None
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return None
+        profiler.pools.discard(self.entry_id)
+        if profiler.pools:
+            return None
+        self.hass.data.pop(DATA_PROFILER, None)
+        path = self.hass.config.path(f"{DOMAIN}_pivot.prof")
+        await self.hass.async_add_executor_job(profiler.dump, path)
+        return path
+
+    def _metric_figures(self):
+        return {
+            **self.metrics.as_dict(),
+            'armed_timers': len(self._timers),
+            'pump_latency_ms': self._commands.latency_summary(self.config.get('pump_switch')),
+            'robot_latency_ms': self._commands.latency_summary(self.config.get('robot_switch')),
+        }
+
+    def sensor_diagnostics(self):
+        """Figures behind the diagnostic sensors, computed once per publish and shared by all of them."""
+        if self._sensor_diagnostics is None:
+            self._sensor_diagnostics = self._metric_figures()
+        return self._sensor_diagnostics
+
+    def diagnostics(self):
+        return {
+            **self._metric_figures(),
+            'fleet_pending_timers': self._scheduler.pending,
+            'profiling': self._profiler is not None,
+            'calibration': self.config.get(CONF_CALIBRATION),
+            'robot_next_edge_s': None if self._robot_handle is None else round(self._robot_handle.when - self._now().timestamp()),
+            'frost_next_check_s': None if self._frost_handle is None else round(self._frost_handle.when - self._now().timestamp()),
+            'history': {
+                key: {name: history.aggregates(name, self._now().timestamp()) for name in history.windows}
+                for key, history in self.history.items()
+            },
+        }
+
+    def _gather_plan_inputs(self, token, temp, frost):
+        """Loop stage: snapshot everything compute_plan reads."""
+        water = self._water_input(temp) if temp is not None else None
+        now = self._now()
+        points = None
+        if not self._tariff_profile:
+            entity_id = self.config.get(CONF_TARIFF_ENTITY)
+            state = self.hass.states.get(entity_id) if entity_id else None
+            if state is not None:
+                if self._tariff_points[0] is not state:
+                    # parsed once per state object; prices only change when the entity updates
+                    self._tariff_points = (state, attribute_points(state.attributes))
+                points = self._tariff_points[1]
+        return PlanInputs(
+            token=token,
+            now=now,
+            today=dt_util.as_local(now).date(),
+            tz=dt_util.DEFAULT_TIME_ZONE,
+            water=water,
+            coef_pct=self.data.adjust_coeff_pct,
+            coeffs=self._coeffs,
+            pivot_hour=self.data.pivot_hour,
+            pause_minutes=self.data.pause_minutes,
+            profile=self._tariff_profile,
+            points=points,
+            solar=bool(self.config.get(CONF_TARIFF_SOLAR)),
+            min_run=int(self.config.get(CONF_MIN_RUN_MINUTES, DEFAULT_MIN_RUN_MINUTES)),
+            max_pause=int(self.config.get(CONF_MAX_PAUSE_MINUTES, DEFAULT_MAX_PAUSE_MINUTES)),
+            masks=dict(self._tariff_masks) if self._tariff_masks else {},
+            rolling=not frost and self.mode == 'ete',
+            outlook=self._outlook(water, now),
+            horizon=self._horizon,
+        )
+
+    def _outlook(self, water, now):
+        if water is None or not self._air_forecast:
+            return ()
+        days = int(self.config.get(CONF_FORECAST_DAYS, DEFAULT_FORECAST_DAYS))
+        mean = water['mean'] if isinstance(water, dict) else water
+        return water_outlook(mean, self._air_forecast, dt_util.as_local(now).date(), days)
+
+    async def _plan(self):
+        """Gather inputs on the loop, compute (in a worker when heavy), apply on the loop.
+
+        A newer plan request cancels the token of the one in flight, so only
+        the newest result is ever applied.
+        """
+        started = perf_counter()
+        if self._plan_token is not None:
+            self._plan_token.cancelled = True
+        token = self._plan_token = CancelToken()
+        temp, outdoor = self._read_temps()
+        # plan figures shared by every entity of this pool
+        self.data.pivot_hour = self.config.get('pivot_hour')
+        self.data.pause_minutes = int(self.config.get('pause_minutes',0))
+        self.data.adjust_coeff_pct = int(self.config.get('adjust_coeff_pct',100))
+        frost_active = self.data.mode == 'frost'
+        hysteresis = float(self.config.get(CONF_TEMP_HYSTERESIS, DEFAULT_TEMP_HYSTERESIS))
+        frost = check_frost_protection(outdoor, self.config.get('no_frost_temperature', 0.0), frost_active, hysteresis)
+        inputs = self._gather_plan_inputs(token, temp, frost)
+        if inputs.heavy:
+            blocked = perf_counter() - started
+            result = await self._planner.async_run(compute_plan, inputs)
+            if result is not None:
+                self.metrics.plan_compute_ms.append(result.compute_ms)
+            started = perf_counter()
+        else:
+            blocked = 0.0
+            result = compute_plan(inputs)
+        if result is None or token.cancelled:
+            self.metrics.plans_superseded += 1
+            return
+        self._plan_token = None
+        try:
+            await self._apply_plan(inputs, result, temp, frost)
+        finally:
+            self.metrics.loop_block_ms.append((blocked + perf_counter() - started) * 1000.0)
+
+    async def _apply_plan(self, inputs, result, temp, frost):
+        """Loop stage: publish the computed plan and converge timers and pump."""
+        water = inputs.water
+        self._plan_temp = water['mean'] if isinstance(water, dict) else water
+        if result.masks or self._tariff_masks:
+            # tariff pools only; the pivot split keeps no masks
+            self._tariff_masks.update(result.masks)
+            for old in [d for d in self._tariff_masks if d < inputs.today - timedelta(days=1)]:
+                del self._tariff_masks[old]
+        self.data.filtration_hours = result.hours
+        self.data.schedule_windows = result.windows
+        if result.hours is not None:
+            self.ledger.set_planned(inputs.now.timestamp(), result.hours)
+            # the rolling horizon: the next plan only recomputes the days whose inputs changed
+            self._horizon = result.horizon
+            self.metrics.horizon_days_computed += result.horizon_computed
+            self.data.horizon = tuple(
+                ForecastDay(day, getattr(result.horizon.get(day), 'temp', None),
+                            result.horizon[day].hours if day in result.horizon else result.hours,
+                            result.horizon_windows.get(day, ()))
+                for day in sorted(result.horizon.keys() | result.horizon_windows.keys())
+            )
 
         # Frost protection
-        if check_frost_protection(outdoor, self.config.get('no_frost_temperature', 0.0)):
+        if frost:
             LOGGER.warning("Frost protection active - forcing pump ON")
-            self.data['filtration_active'] = True
-            self.data['mode'] = 'frost'
-            # schedule remains until temp above threshold — implement periodic re-check
+            self.data.mode = 'frost'
+            # released by the frost watchdog or a sensor event once outdoor rises above threshold + hysteresis
+            self._sync_timers({})
+            await self._converge_pump(True)
             return
 
         # respect modes
         if self.mode == 'off':
-            self.data['filtration_active'] = False
-            self.data['mode'] = 'off'
+            self.data.mode = 'off'
+            self._sync_timers({})
+            await self._converge_pump(False)
             return
         if self.mode == 'continu':
-            self.data['filtration_active'] = True
-            self.data['mode'] = 'continu'
+            self.data.mode = 'continu'
+            self._sync_timers({})
+            await self._converge_pump(True)
             return
         if self.mode == 'hiver':
-            # run short cycle
-            self.data['filtration_active'] = True
-            self.data['mode'] = 'hiver'
-            # schedule off after cut_duration
-            handle = async_call_later(self.hass, int(self.config.get('cut_duration_minutes',60))*60, self._end_hiver)
-            self._scheduled.append(handle)
+            # run short cycle, keeping an already armed cut-off
+            self.data.mode = 'hiver'
+            armed = [key for key in self._timers if key[0] == 'hiver']
+            resumed = self._cache.pop('hiver_until', None)
+            if armed:
+                desired = {armed[0]: None}
+            elif resumed and resumed > self._now().timestamp():
+                desired = {('hiver', int(resumed)): dt_util.utc_from_timestamp(resumed)}
+            elif self._hiver_done is not None:
+                # the cut already ran since the pivot: a replan must not start another one
+                self.data.mode = 'ete'
+                self._sync_timers({})
+                await self._converge_pump(False)
+                return
+            else:
+                when = self._scheduler.now() + timedelta(minutes=int(self.config.get('cut_duration_minutes',60)))
+                desired = {('hiver', int(when.timestamp())): when}
+            self._sync_timers(desired)
+            await self._converge_pump(True)
             return
 
-        # ete: compute duration and schedule two windows
-        if temp is None:
+        # ete: schedule the rolling windows
+        if temp is not None:
+            self._intervals = result.intervals
+        elif self._cache.get('intervals'):
+            LOGGER.info("No water temperature available, resuming the cached windows")
+            self._intervals = [tuple(interval) for interval in self._cache['intervals']]
+        else:
             LOGGER.warning("No water temperature available")
+            self._sync_timers({})
             return
-        coef = int(self.config.get('adjust_coeff_pct',100))
-        total_hours = compute_filtration_duration_cubic(temp, coef)
-        windows = compute_schedule_windows(self.config.get('pivot_hour'), int(self.config.get('pause_minutes',0)), total_hours)
-
-        self.data['filtration_active'] = False
-        self.data['mode'] = 'ete'
-        self.data['schedule_windows'] = windows
-
-        # schedule actions
-        now_dt = datetime.now()
-        for start, end in windows:
-            if start <= now_dt <= end:
-                # turn on until end
-                await self.hass.services.async_call('switch','turn_on',{'entity_id': self.config.get('pump_switch')})
-                handle = async_call_later(self.hass, (end - now_dt).total_seconds(), self._turn_off_pump)
-                self._scheduled.append(handle)
-                self.data['filtration_active'] = True
-            elif now_dt < start:
-                # schedule on/off
-                handle_on = async_call_later(self.hass, (start - now_dt).total_seconds(), self._turn_on_pump)
-                handle_off = async_call_later(self.hass, (end - now_dt).total_seconds(), self._turn_off_pump)
-                self._scheduled.extend([handle_on, handle_off])
+        self.data.mode = 'ete'
+
+        now_ts = self._now().timestamp()
+        timers = self._timers
+        desired = {}
+        want_on = False
+        # edges already armed keep their handle, so only new ones need a datetime
+        for start, end in self._intervals:
+            if start <= now_ts < end:
+                want_on = True
+            if now_ts < start:
+                key = ('on', int(start))
+                desired[key] = None if key in timers else dt_util.utc_from_timestamp(start)
+            if now_ts < end:
+                key = ('off', int(end))
+                desired[key] = None if key in timers else dt_util.utc_from_timestamp(end)
+        self._sync_timers(desired)
+        await self._converge_pump(want_on)
+
+    def _sync_timers(self, desired):
+        """Diff the wanted edges against the armed ones; only touch what changed."""
+        for key in [key for key in self._timers if key not in desired]:
+            self._timers.pop(key).cancel()
+        added = 0
+        for key, when in desired.items():
+            if key not in self._timers:
+                self._timers[key] = self._scheduler.async_schedule_at(when, partial(self._run_timer, key))
+                added += 1
+        LOGGER.debug("PoolController(%s) timers: %d armed, %d added", self.entry_id, len(self._timers), added)
+
+    async def _run_timer(self, key, now):
+        handle = self._timers.pop(key, None)
+        if handle is not None:
+            drift_ms = (self._now().timestamp() - handle.when) * 1000.0
+            self.metrics.timer_drift_ms.append(drift_ms)
+            if key[0] == 'on':
+                self.metrics.start_jitter_ms.append(abs(drift_ms))
+        action = key[0]
+        if action == 'on':
+            await self._turn_on_pump()
+        elif action == 'off':
+            await self._turn_off_pump()
+        elif action == 'hiver':
+            await self._end_hiver()
+
+    async def _converge_pump(self, on: bool):
+        # only command the pump when the wanted state differs from the known one
+        if on and not self.data.filtration_active:
+            await self._turn_on_pump()
+        elif not on and self.data.filtration_active:
+            await self._turn_off_pump()
 
     async def _turn_on_pump(self, *_):
-        await self.hass.services.async_call('switch','turn_on',{'entity_id': self.config.get('pump_switch')})
-        self.data['filtration_active'] = True
+        # queued on the command bus; never blocks the scheduler or the pivot
+        self._commands.async_submit(self.config.get('pump_switch'), True)
+        self._set_filtration(True)
+        self._arm_robot()
+        self._publish()
 
     async def _turn_off_pump(self, *_):
-        await self.hass.services.async_call('switch','turn_off',{'entity_id': self.config.get('pump_switch')})
-        self.data['filtration_active'] = False
+        # the robot depends on the pump: it never outlives a run
+        self._stop_robot()
+        self._commands.async_submit(self.config.get('pump_switch'), False)
+        self._set_filtration(False)
+        self._publish()
+
+    def _set_filtration(self, on: bool):
+        # every pump edge goes through here so the ledger sees each one exactly once
+        ts = self._now().timestamp()
+        if on:
+            self.ledger.on(ts)
+        else:
+            self.ledger.off(ts)
+        self.data.filtration_active = on
+        self._schedule_save()
+
+    def _robot_switch(self):
+        return self.config.get('robot_switch') if self.config.get('robot_enabled') else None
+
+    def _robot_budget(self):
+        """Seconds of robot time left today out of robot_duration_minutes."""
+        today = dt_util.as_local(self._now()).date()
+        if self._robot_day != today:
+            self._robot_day, self._robot_used = today, 0.0
+        cap = 60.0 * float(self.config.get(CONF_ROBOT_DURATION_MINUTES, DEFAULT_ROBOT_DURATION_MINUTES))
+        return max(0.0, cap - self._robot_used)
+
+    def _arm_robot(self):
+        # a pump start arms the robot start after the lead time, once per run
+        if not self._robot_switch() or self.data.robot_active or self._robot_handle or self.data.mode == 'frost':
+            return
+        if self._robot_budget() <= 0:
+            return
+        lead = 60.0 * float(self.config.get(CONF_ROBOT_LEAD_MINUTES, DEFAULT_ROBOT_LEAD_MINUTES))
+        self._robot_handle = self._scheduler.async_schedule_in(lead, self._run_robot)
+
+    @callback
+    def _run_robot(self, now):
+        self._robot_handle = None
+        budget = self._robot_budget()
+        if self.data.filtration_active and budget > 0:
+            self._start_robot(budget)
+
+    def _start_robot(self, seconds):
+        self._commands.async_submit(self._robot_switch(), True)
+        self.data.robot_active = True
+        self._robot_since = self._now().timestamp()
+        self._robot_handle = self._scheduler.async_schedule_in(seconds, self._stop_robot)
+        self._publish()
+
+    @callback
+    def _stop_robot(self, *_):
+        if self._robot_handle:
+            self._robot_handle.cancel()
+            self._robot_handle = None
+        if not self.data.robot_active:
+            return
+        self._commands.async_submit(self._robot_switch(), False)
+        self._robot_budget()
+        self._robot_used += self._now().timestamp() - self._robot_since
+        self.data.robot_active = False
+        self._publish()
+
+    async def async_set_robot(self, on: bool):
+        """Manual robot control; a manual start skips the lead time but still stops with the pump."""
+        if not self._robot_switch():
+            return
+        if not on:
+            self._stop_robot()
+        elif not self.data.filtration_active:
+            LOGGER.warning("Robot start ignored for %s: the pump is not running", self.entry_id)
+        elif not self.data.robot_active:
+            if self._robot_handle:
+                self._robot_handle.cancel()
+                self._robot_handle = None
+            budget = self._robot_budget()
+            self._start_robot(budget or 60.0 * float(self.config.get(CONF_ROBOT_DURATION_MINUTES, DEFAULT_ROBOT_DURATION_MINUTES)))
 
     async def _end_hiver(self, *_):
+        self._hiver_done = self._now().timestamp()
         await self._turn_off_pump()
-        self.data['mode'] = 'ete'
\ No newline at end of file
+        self.data.mode = 'ete'
+        self._publish()
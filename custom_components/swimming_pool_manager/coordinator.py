@@ -0,0 +1,21 @@
+"""Per-pool coordinator pushing controller snapshots to entities."""
+import logging
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from .const import DOMAIN
+
+LOGGER = logging.getLogger(__name__)
+
+class PoolCoordinator(DataUpdateCoordinator):
+    """Push-only coordinator: the controller computes a snapshot once and fans it out.
+
+    There is no update interval; entities never poll. A manual refresh simply
+    republishes the controller's current snapshot without recomputing it.
+    """
+
+    def __init__(self, hass, controller):
+        super().__init__(
+            hass,
+            LOGGER,
+            name=f"{DOMAIN}_{controller.entry_id}",
+            update_method=controller.async_snapshot,
+        )
@@ -0,0 +1,34 @@
+"""Diagnostics download for a Swimming Pool Manager entry."""
+from datetime import date
+from .calculation import ScheduleWindow
+from .const import DOMAIN
+from .forecast import ForecastDay
+from .ledger import LedgerSnapshot
+
+
+def _serialize(value):
+    if isinstance(value, ScheduleWindow):
+        return {'start': value.start_iso, 'end': value.end_iso}
+    if isinstance(value, ForecastDay):
+        return {'day': value.day.isoformat(), 'temp': value.temp, 'hours': value.hours, 'windows': _serialize(value.windows)}
+    if isinstance(value, LedgerSnapshot):
+        return {**value._asdict(), 'day': value.day.isoformat()}
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_serialize(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _serialize(v) for k, v in value.items()}
+    return value
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    controller = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if controller is None:
+        return {'config': dict(entry.data), 'loaded': False}
+    return {
+        'config': dict(controller.config),
+        'mode': controller.mode,
+        'data': _serialize(controller.data.as_dict()),
+        'metrics': controller.diagnostics(),
+    }
@@ -0,0 +1,24 @@
+"""Base entity fed by the per-pool coordinator."""
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+
+class PoolEntity(CoordinatorEntity):
+    """Coordinator entity that only writes state when its own value changes."""
+
+    def __init__(self, controller):
+        super().__init__(controller.coordinator)
+        self.controller = controller
+        self._value = self._extract(controller.coordinator.data or {})
+
+    def _extract(self, data):
+        """Return the part of the snapshot this entity renders."""
+        raise NotImplementedError
+
+    @callback
+    def _handle_coordinator_update(self):
+        value = self._extract(self.coordinator.data or {})
+        if value == self._value:
+            return
+        self._value = value
+        self.async_write_ha_state()
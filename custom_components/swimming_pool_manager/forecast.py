@@ -0,0 +1,120 @@
+"""Weather forecast input of the multi-day planner: daily air means and the water temperature outlook."""
+import csv
+import json
+import logging
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from .calculation import compute_filtration_duration_batch
+
+LOGGER = logging.getLogger(__name__)
+
+# fraction of the gap to the day's mean air temperature the water closes per day (pool thermal inertia)
+WATER_RELAXATION = 0.2
+
+HorizonDay = namedtuple('HorizonDay', ('day', 'temp', 'hours', 'basis'))
+# published per future day: predicted water temperature (None without a forecast), hours and windows
+ForecastDay = namedtuple('ForecastDay', ('day', 'temp', 'hours', 'windows'))
+
+
+def daily_means(items, tz):
+    """[(local date, mean air °C)] from weather forecast entries (``datetime``, ``temperature``, optional ``templow``).
+
+    Hourly entries are averaged per day; a daily entry counts as the mean of
+    its high and low.
+    """
+    sums = {}
+    for item in items or ():
+        if not isinstance(item, dict) or item.get('temperature') is None:
+            continue
+        moment = item.get('datetime')
+        moment = moment if isinstance(moment, datetime) else dt_util.parse_datetime(str(moment)) if moment else None
+        if moment is None:
+            continue
+        try:
+            high = float(item['temperature'])
+            value = (high + float(item['templow'])) / 2.0 if item.get('templow') is not None else high
+        except (TypeError, ValueError):
+            continue
+        day = moment.astimezone(tz).date() if moment.tzinfo else moment.date()
+        total, count = sums.get(day, (0.0, 0))
+        sums[day] = (total + value, count + 1)
+    return sorted((day, total / count) for day, (total, count) in sums.items())
+
+
+def load_forecast_file(path):
+    """Local stand-in for a forecast entity: ``YYYY-MM-DD,air_temp`` CSV rows or the entity's JSON forecast list.
+
+    Blocking: run in an executor.
+    """
+    with open(path, encoding='utf-8') as handle:
+        if str(path).endswith('.json'):
+            return daily_means(json.load(handle), dt_util.DEFAULT_TIME_ZONE)
+        rows = [row[:2] for row in csv.reader(handle) if len(row) >= 2 and not row[0].startswith('#')]
+    days = []
+    for when, temp in rows:
+        try:
+            days.append((date.fromisoformat(when.strip()), float(temp)))
+        except ValueError:
+            continue  # header or malformed row
+    if not days:
+        raise ValueError(f"No forecast rows in {path}")
+    return sorted(days)
+
+
+async def async_fetch_forecast(hass, entity_id):
+    """Daily forecast entries of a weather entity, through weather.get_forecasts or the legacy attribute."""
+    try:
+        response = await hass.services.async_call(
+            'weather', 'get_forecasts', {'entity_id': entity_id, 'type': 'daily'},
+            blocking=True, return_response=True,
+        )
+        return (response or {}).get(entity_id, {}).get('forecast') or []
+    except (HomeAssistantError, ValueError) as err:
+        LOGGER.debug("weather.get_forecasts failed for %s (%s), using the forecast attribute", entity_id, err)
+    state = hass.states.get(entity_id)
+    return (state.attributes.get('forecast') if state else None) or []
+
+
+def water_outlook(water_now, air_days, today, days):
+    """Predicted water temperature, rounded to 0.1 °C, for each of the next ``days`` days after today.
+
+    The water relaxes toward each day's mean air temperature by
+    WATER_RELAXATION; days the forecast does not cover end the outlook.
+    """
+    air = dict(air_days)
+    outlook = []
+    water = float(water_now)
+    for offset in range(days + 1):
+        day = today + timedelta(days=offset)
+        if day not in air:
+            if offset == 0:
+                continue  # the forecast may start tomorrow
+            break
+        water += WATER_RELAXATION * (air[day] - water)
+        if offset:
+            outlook.append((day, round(water, 1)))
+    return tuple(outlook)
+
+
+def update_horizon(previous, outlook, coef_pct, coeffs):
+    """Rolling horizon {day: HorizonDay} for outlook, reusing previous entries whose inputs did not change.
+
+    Only the new or changed days go through one batched curve evaluation.
+    Returns the horizon and how many days were computed.
+    """
+    basis = (coef_pct, coeffs)
+    horizon = {}
+    todo = []
+    for day, temp in outlook:
+        old = previous.get(day)
+        if old is not None and old.temp == temp and old.basis == basis:
+            horizon[day] = old
+        else:
+            todo.append((day, temp))
+    if todo:
+        hours = compute_filtration_duration_batch([temp for _, temp in todo], coef_pct, coeffs)
+        for (day, temp), value in zip(todo, hours):
+            horizon[day] = HorizonDay(day, temp, float(value), basis)
+    return horizon, len(todo)
@@ -0,0 +1,144 @@
+"""In-memory rolling temperature history with constant-time window aggregates."""
+from array import array
+from collections import deque
+
+HISTORY_RESOLUTION_SEC = 60
+HISTORY_HORIZON_SEC = 24 * 3600
+
+_EMPTY = float('nan')
+
+
+class _Window:
+    """Running sum and monotonic min/max queues over the last ``span`` slots."""
+
+    __slots__ = ('span', 'sum', 'count', 'tail', 'max_q', 'min_q')
+
+    def __init__(self, span):
+        self.span = span
+        self.sum = 0.0
+        self.count = 0
+        self.tail = None
+        self.max_q = deque()
+        self.min_q = deque()
+
+
+class TemperatureHistory:
+    """Circular buffer of one sensor's readings, one ``array('f')`` slot per resolution step.
+
+    Readings falling in the same slot are averaged, so memory is fixed by
+    ``horizon / resolution`` whatever the sensor update rate. Mean, min and
+    max over each configured window are kept incrementally: adding a sample
+    or reading an aggregate is amortized O(1).
+
+    Slots that got no reading hold NaN, so the ring needs no per-slot index:
+    every other position belongs to one of the last ``capacity`` slots.
+    """
+
+    def __init__(self, windows, resolution=HISTORY_RESOLUTION_SEC, horizon=None):
+        self.resolution = int(resolution)
+        spans = {name: max(1, int(seconds) // self.resolution) for name, seconds in windows.items()}
+        self.capacity = max([int(horizon or 0) // self.resolution, *spans.values()])
+        self._values = array('f', [_EMPTY]) * self.capacity
+        self._windows = {name: _Window(span) for name, span in spans.items()}
+        self._newest = None
+        self._slot = None
+        self._acc = 0.0
+        self._acc_n = 0
+
+    def __len__(self):
+        return sum(1 for value in self._values if value == value)
+
+    @property
+    def windows(self):
+        return list(self._windows)
+
+    def add(self, ts: float, value: float):
+        """Record a reading taken at ``ts`` (epoch seconds); older-than-current readings are dropped."""
+        if value is None or value != value:
+            return
+        slot = int(ts // self.resolution)
+        if self._slot is None or slot > self._slot:
+            self._commit()
+            self._slot, self._acc, self._acc_n = slot, 0.0, 0
+        elif slot < self._slot:
+            return
+        self._acc += value
+        self._acc_n += 1
+
+    def _commit(self):
+        if not self._acc_n:
+            return
+        slot, value = self._slot, self._acc / self._acc_n
+        # expire first: the ring position may still hold a slot that is leaving a window
+        for window in self._windows.values():
+            self._expire(window, slot)
+        if self._newest is not None:
+            # empty the positions of the slots skipped since the last reading, after
+            # expiring, so none of them can still be counted by a window
+            for skipped in range(max(self._newest + 1, slot - self.capacity + 1), slot):
+                self._values[skipped % self.capacity] = _EMPTY
+        self._newest = slot
+        pos = slot % self.capacity
+        self._values[pos] = value
+        value = self._values[pos]
+        for window in self._windows.values():
+            window.sum += value
+            window.count += 1
+            if window.tail is None:
+                window.tail = slot
+            while window.max_q and self._value(window.max_q[-1]) <= value:
+                window.max_q.pop()
+            window.max_q.append(slot)
+            while window.min_q and self._value(window.min_q[-1]) >= value:
+                window.min_q.pop()
+            window.min_q.append(slot)
+
+    def _value(self, slot):
+        return self._values[slot % self.capacity]
+
+    def _expire(self, window, newest):
+        # walk the tail forward; every slot is passed once, so this amortizes to O(1)
+        oldest = newest - window.span + 1
+        tail = window.tail
+        while tail is not None and tail < oldest and window.count:
+            # a position is only ever reused after its slot left every window
+            value = self._values[tail % self.capacity]
+            if value == value:
+                window.sum -= value
+                window.count -= 1
+            tail += 1
+        window.tail = tail if window.count else None
+        while window.max_q and window.max_q[0] < oldest:
+            window.max_q.popleft()
+        while window.min_q and window.min_q[0] < oldest:
+            window.min_q.popleft()
+
+    def aggregates(self, name, now: float = None):
+        """Mean, min, max and slot count over window ``name``, including the open slot.
+
+        With ``now`` the window ends at that instant, so a silent sensor ages out.
+        """
+        window = self._windows[name]
+        if now is not None:
+            self._expire(window, int(now // self.resolution))
+        total, count = window.sum, window.count
+        high = self._value(window.max_q[0]) if window.max_q else None
+        low = self._value(window.min_q[0]) if window.min_q else None
+        if self._acc_n and (now is None or self._slot > int(now // self.resolution) - window.span):
+            current = self._acc / self._acc_n
+            total += current
+            count += 1
+            high = current if high is None else max(high, current)
+            low = current if low is None else min(low, current)
+        if not count:
+            return {'mean': None, 'min': None, 'max': None, 'count': 0}
+        return {'mean': total / count, 'min': low, 'max': high, 'count': count}
+
+    def mean(self, name, now: float = None):
+        return self.aggregates(name, now)['mean']
+
+    def max(self, name, now: float = None):
+        return self.aggregates(name, now)['max']
+
+    def min(self, name, now: float = None):
+        return self.aggregates(name, now)['min']
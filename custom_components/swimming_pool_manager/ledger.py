@@ -0,0 +1,105 @@
+"""Streaming pump runtime ledger: per-day, per-week and per-season counters updated on pump edges."""
+from collections import namedtuple
+from datetime import date, timedelta
+from homeassistant.util import dt as dt_util
+
+LEDGER_VERSION = 1
+
+LedgerSnapshot = namedtuple('LedgerSnapshot', (
+    'day', 'today_h', 'week_h', 'season_h', 'total_h', 'starts_today', 'starts_total', 'planned_h',
+))
+
+
+class RuntimeLedger:
+    """Pump runtime and starts for the local day, ISO week and season (calendar year), plus lifetime totals.
+
+    Every update is O(1): counters only move on an on/off edge or when read,
+    crediting the running pump up to that instant; a run crossing midnight
+    is split at the boundary so each period gets its own share.
+    """
+
+    __slots__ = (
+        'day', 'day_end', 'on_since', 'today_s', 'week_s', 'season_s', 'total_s',
+        'starts_today', 'starts_total', 'planned_h',
+    )
+
+    def __init__(self):
+        self.day = None
+        self.day_end = 0.0
+        self.on_since = None
+        self.today_s = self.week_s = self.season_s = self.total_s = 0.0
+        self.starts_today = self.starts_total = 0
+        self.planned_h = None
+
+    def _credit(self, until):
+        if self.on_since is None:
+            return
+        seconds = max(0.0, until - self.on_since)
+        self.today_s += seconds
+        self.week_s += seconds
+        self.season_s += seconds
+        self.total_s += seconds
+        self.on_since = max(self.on_since, until)
+
+    def _roll(self, ts):
+        if ts < self.day_end:
+            # same local day as the last read: no calendar work
+            self._credit(ts)
+            return
+        today = dt_util.as_local(dt_util.utc_from_timestamp(ts)).date()
+        if self.day is None:
+            self.day = today
+        # normally at most one midnight between two reads; a long outage loops once per day
+        while self.day < today:
+            following = self.day + timedelta(days=1)
+            self._credit(dt_util.start_of_local_day(following).timestamp())
+            self.today_s = 0.0
+            self.starts_today = 0
+            if following.isocalendar()[:2] != self.day.isocalendar()[:2]:
+                self.week_s = 0.0
+            if following.year != self.day.year:
+                self.season_s = 0.0
+            self.day = following
+        self.day_end = dt_util.start_of_local_day(self.day + timedelta(days=1)).timestamp()
+        self._credit(ts)
+
+    def on(self, ts):
+        self._roll(ts)
+        if self.on_since is None:
+            self.on_since = ts
+            self.starts_today += 1
+            self.starts_total += 1
+
+    def off(self, ts):
+        self._roll(ts)
+        self.on_since = None
+
+    def set_planned(self, ts, hours):
+        # kept across midnight: the rolling plan arms today's runs from the last computed hours
+        self._roll(ts)
+        self.planned_h = hours
+
+    def snapshot(self, ts):
+        self._roll(ts)
+        return LedgerSnapshot(
+            self.day, self.today_s / 3600.0, self.week_s / 3600.0, self.season_s / 3600.0, self.total_s / 3600.0,
+            self.starts_today, self.starts_total, self.planned_h,
+        )
+
+    def as_list(self):
+        """Compact persisted form: version, day ordinal, then the counters (seconds)."""
+        return [
+            LEDGER_VERSION, self.day.toordinal() if self.day else None, self.on_since,
+            round(self.today_s), round(self.week_s), round(self.season_s), round(self.total_s),
+            self.starts_today, self.starts_total, self.planned_h,
+        ]
+
+    @classmethod
+    def from_list(cls, values):
+        ledger = cls()
+        if not values or values[0] != LEDGER_VERSION:
+            return ledger
+        (_, day, ledger.on_since, ledger.today_s, ledger.week_s, ledger.season_s, ledger.total_s,
+         ledger.starts_today, ledger.starts_total, ledger.planned_h) = values
+        ledger.day = date.fromordinal(day) if day else None
+        return ledger
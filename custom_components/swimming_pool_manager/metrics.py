@@ -0,0 +1,150 @@
+"""Bounded runtime metrics and optional profiling for a PoolController."""
+import cProfile
+import logging
+from collections import deque
+from .const import DATA_PROFILER
+
+LOGGER = logging.getLogger(__name__)
+
+METRICS_WINDOW = 256
+
+
+class RingBuffer:
+    """Fixed-size sample window; the oldest sample is dropped when full."""
+
+    __slots__ = ('_samples',)
+
+    def __init__(self, size=METRICS_WINDOW):
+        self._samples = deque(maxlen=size)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def append(self, value):
+        self._samples.append(value)
+
+    @property
+    def last(self):
+        return self._samples[-1] if self._samples else None
+
+    def percentile(self, pct):
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+    def summary(self):
+        if not self._samples:
+            return {'count': 0, 'last': None, 'p50': None, 'p95': None, 'max': None}
+        # one sort for every figure
+        ordered = sorted(self._samples)
+        top = len(ordered) - 1
+        return {
+            'count': len(ordered),
+            'last': self._samples[-1],
+            'p50': ordered[int(round(0.5 * top))],
+            'p95': ordered[int(round(0.95 * top))],
+            'max': ordered[-1],
+        }
+
+
+class PoolMetrics:
+    """Pivot duration, loop blocking, timer drift, pump start jitter and recompute count of one controller (milliseconds)."""
+
+    def __init__(self, size=METRICS_WINDOW):
+        self.pivot_ms = RingBuffer(size)
+        self.timer_drift_ms = RingBuffer(size)
+        self.start_jitter_ms = RingBuffer(size)
+        # time a plan held the loop (gather + apply, and compute when run inline) vs compute time in a worker
+        self.loop_block_ms = RingBuffer(size)
+        self.plan_compute_ms = RingBuffer(size)
+        self.recomputes = 0
+        self.plans_superseded = 0
+        self.horizon_days_computed = 0
+        self.frost_checks = 0
+        self.setup_ms = None
+        self.first_plan_ms = None
+
+    def as_dict(self):
+        return {
+            'setup_ms': self.setup_ms,
+            'first_plan_ms': self.first_plan_ms,
+            'pivot_ms': self.pivot_ms.summary(),
+            'loop_block_ms': self.loop_block_ms.summary(),
+            'plan_compute_ms': self.plan_compute_ms.summary(),
+            'timer_drift_ms': self.timer_drift_ms.summary(),
+            'start_jitter_ms': self.start_jitter_ms.summary(),
+            'recomputes': self.recomputes,
+            'plans_superseded': self.plans_superseded,
+            'horizon_days_computed': self.horizon_days_computed,
+            'frost_checks': self.frost_checks,
+        }
+
+
+class PivotProfiler:
+    """cProfile (or yappi when installed and requested) capture around pivot handling.
+
+    One instance serves the whole integration, since the interpreter only
+    takes one profiler at a time. It runs while any profiled pivot is in
+    flight, so overlapping pivots share the capture; awaits inside them also
+    capture whatever else the loop schedules meanwhile. pools holds the
+    entry ids still profiling.
+    """
+
+    def __init__(self, backend='cprofile'):
+        self.backend = backend
+        self.runs = 0
+        self.pools = set()
+        self._active = 0
+        if backend == 'yappi':
+            import yappi
+
+            yappi.set_clock_type('wall')
+            self._yappi = yappi
+            self._profile = None
+        else:
+            self._yappi = None
+            self._profile = cProfile.Profile()
+
+    def enable(self):
+        """Count one more pivot in flight; False when the profiler could not start."""
+        if not self._active:
+            try:
+                if self._yappi:
+                    self._yappi.start()
+                else:
+                    self._profile.enable()
+            except ValueError as err:
+                # Python 3.12+: another profiling tool already holds the interpreter hook
+                LOGGER.warning("Pivot profiling unavailable: %s", err)
+                return False
+        self._active += 1
+        self.runs += 1
+        return True
+
+    def disable(self):
+        self._active -= 1
+        if self._active:
+            return
+        if self._yappi:
+            self._yappi.stop()
+        else:
+            self._profile.disable()
+
+    def dump(self, path):
+        """Write the captured stats (pstats format); blocking, run in an executor."""
+        if self._yappi:
+            self._yappi.get_func_stats().save(path, type='pstat')
+            self._yappi.clear_stats()
+        else:
+            self._profile.dump_stats(path)
+        LOGGER.info("Pivot profile (%d runs) written to %s", self.runs, path)
+
+
+def async_get_pivot_profiler(hass, backend='cprofile'):
+    profiler = hass.data.get(DATA_PROFILER)
+    if profiler is None:
+        profiler = hass.data[DATA_PROFILER] = PivotProfiler(backend)
+    elif profiler.backend != backend:
+        LOGGER.warning("Pivot profiling already runs with %s, ignoring %s", profiler.backend, backend)
+    return profiler
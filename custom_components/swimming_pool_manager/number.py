@@ -2,75 +2,76 @@
 import logging
 from homeassistant.components.number import NumberEntity
 from homeassistant.helpers.entity_platform import async_get_current_platform
-from .const import CONF_ADJUST_COEFF, CONF_PAUSE_MINUTES, CONF_CUT_DURATION_MIN, CONF_ANTI_FREEZE_TEMP, DOMAIN
+from .const import CONF_ADJUST_COEFF, CONF_PAUSE_MINUTES, CONF_CUT_DURATION_MIN, CONF_NO_FROST_TEMP, DOMAIN
 
 LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     controller = hass.data.get(DOMAIN, {}).get(entry.entry_id)
-    entities = [AdjustCoeffNumber(controller, entry.entry_id), PauseNumber(controller, entry.entry_id), CutDurationNumber(controller, entry.entry_id), AntiFreezeNumber(controller, entry.entry_id)]
+    entities = [AdjustCoeffNumber(controller), PauseNumber(controller), CutDurationNumber(controller), AntiFreezeNumber(controller)]
     async_add_entities(entities)
 
-class AdjustCoeffNumber(NumberEntity):
-    def __init__(self, controller, entry_id):
-        self.controller = controller
-        self._attr_name = f"Pool Adjust Coeff {entry_id}"
-        self._attr_unique_id = f"{entry_id}_adjust_coeff"
-        self._attr_native_min_value = 10
-        self._attr_native_max_value = 100
-        self._attr_native_step = 1
-
-    @property
-    def native_value(self):
-        return int(self.controller.config.get('adjust_coeff_pct',100))
+class PoolNumber(NumberEntity):
+    """Config option number; everything but the controller reference is class-level."""
+    _attr_should_poll = False
+    _label = None
+    _suffix = None
+    _key = None
+    _default = None
+    _cast = int
 
-    async def async_set_native_value(self, value):
-        self.controller.update_config('adjust_coeff_pct', int(value))
-
-class PauseNumber(NumberEntity):
-    def __init__(self, controller, entry_id):
+    def __init__(self, controller):
         self.controller = controller
-        self._attr_name = f"Pool Pause Minutes {entry_id}"
-        self._attr_unique_id = f"{entry_id}_pause_minutes"
-        self._attr_native_min_value = 0
-        self._attr_native_max_value = 1440
-        self._attr_native_step = 1
 
     @property
-    def native_value(self):
-        return int(self.controller.config.get('pause_minutes',0))
-
-    async def async_set_native_value(self, value):
-        self.controller.update_config('pause_minutes', int(value))
+    def name(self):
+        return f"Pool {self._label} {self.controller.entry_id}"
 
-class CutDurationNumber(NumberEntity):
-    def __init__(self, controller, entry_id):
-        self.controller = controller
-        self._attr_name = f"Pool Cut Duration Min {entry_id}"
-        self._attr_unique_id = f"{entry_id}_cut_minutes"
-        self._attr_native_min_value = 1
-        self._attr_native_max_value = 1440
-        self._attr_native_step = 1
+    @property
+    def unique_id(self):
+        return f"{self.controller.entry_id}_{self._suffix}"
 
     @property
     def native_value(self):
-        return int(self.controller.config.get('cut_duration_minutes',60))
+        return self._cast(self.controller.config.get(self._key, self._default))
 
     async def async_set_native_value(self, value):
-        self.controller.update_config('cut_duration_minutes', int(value))
+        await self.controller.async_update_config(self._key, self._cast(value))
+        self.async_write_ha_state()
 
-class AntiFreezeNumber(NumberEntity):
-    def __init__(self, controller, entry_id):
-        self.controller = controller
-        self._attr_name = f"Pool No Frost Temp {entry_id}"
-        self._attr_unique_id = f"{entry_id}_nofrost_temp"
-        self._attr_native_min_value = -20
-        self._attr_native_max_value = 20
-        self._attr_native_step = 0.1
+class AdjustCoeffNumber(PoolNumber):
+    _label = "Adjust Coeff"
+    _suffix = "adjust_coeff"
+    _key = CONF_ADJUST_COEFF
+    _default = 100
+    _attr_native_min_value = 10
+    _attr_native_max_value = 100
+    _attr_native_step = 1
 
-    @property
-    def native_value(self):
-        return float(self.controller.config.get('no_frost_temperature',0.0))
+class PauseNumber(PoolNumber):
+    _label = "Pause Minutes"
+    _suffix = "pause_minutes"
+    _key = CONF_PAUSE_MINUTES
+    _default = 0
+    _attr_native_min_value = 0
+    _attr_native_max_value = 1440
+    _attr_native_step = 1
 
-    async def async_set_native_value(self, value):
-        self.controller.update_config('no_frost_temperature', float(value))
+class CutDurationNumber(PoolNumber):
+    _label = "Cut Duration Min"
+    _suffix = "cut_minutes"
+    _key = CONF_CUT_DURATION_MIN
+    _default = 60
+    _attr_native_min_value = 1
+    _attr_native_max_value = 1440
+    _attr_native_step = 1
+
+class AntiFreezeNumber(PoolNumber):
+    _label = "No Frost Temp"
+    _suffix = "nofrost_temp"
+    _key = CONF_NO_FROST_TEMP
+    _default = 0.0
+    _cast = float
+    _attr_native_min_value = -20
+    _attr_native_max_value = 20
+    _attr_native_step = 0.1
@@ -0,0 +1,236 @@
+"""Tariff-aware placement of the daily filtration runtime over 15-minute slots."""
+import csv
+import json
+import logging
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
+from homeassistant.util import dt as dt_util
+from .calculation import ScheduleWindow
+
+LOGGER = logging.getLogger(__name__)
+
+SLOT_MINUTES = 15
+# tie-break per run start: among equal-cost plans prefer fewer pump starts
+_START_PENALTY = 1e-6
+
+
+def day_slots(day, tz):
+    """First slot of the local day as a UTC instant, and the slot count (92/96/100 on DST days)."""
+    start = datetime.combine(day, time(0), tzinfo=tz).astimezone(timezone.utc)
+    end = datetime.combine(day + timedelta(days=1), time(0), tzinfo=tz).astimezone(timezone.utc)
+    return start, int((end - start).total_seconds()) // (SLOT_MINUTES * 60)
+
+
+def load_tariff_profile(path):
+    """Read a daily time-of-day profile, ``HH:MM,price`` CSV rows or a ``{"HH:MM": price}`` JSON object.
+
+    Each price holds until the next listed time. Blocking: run in an executor.
+    """
+    with open(path, encoding='utf-8') as handle:
+        if str(path).endswith('.json'):
+            rows = list(json.load(handle).items())
+        else:
+            rows = [row[:2] for row in csv.reader(handle) if len(row) >= 2 and not row[0].startswith('#')]
+    profile = []
+    for when, price in rows:
+        try:
+            hours, minutes = str(when).split(':')[:2]
+            profile.append((int(hours) * 60 + int(minutes), float(price)))
+        except ValueError:
+            continue  # header or malformed row
+    if not profile:
+        raise ValueError(f"No tariff rows in {path}")
+    return sorted(profile)
+
+
+def profile_costs(profile, day, tz):
+    """Per-slot prices of day from a time-of-day profile (the last entry wraps to midnight)."""
+    start, count = day_slots(day, tz)
+    costs = []
+    for i in range(count):
+        local = (start + timedelta(minutes=i * SLOT_MINUTES)).astimezone(tz)
+        minute = local.hour * 60 + local.minute
+        price = profile[-1][1]
+        for at, value in profile:
+            if at > minute:
+                break
+            price = value
+        costs.append(price)
+    return costs
+
+
+def series_costs(points, day, tz, solar=False):
+    """Per-slot prices of day from [(start epoch, value)] (e.g. a price entity's hourly attribute list).
+
+    Returns None unless the whole day is covered. With solar, values are
+    surplus power and the cost is its negation.
+    """
+    if not points:
+        return None
+    start, count = day_slots(day, tz)
+    first = start.timestamp()
+    if points[0][0] > first:
+        return None
+    costs = []
+    j = 0
+    for i in range(count):
+        ts = first + i * SLOT_MINUTES * 60
+        while j + 1 < len(points) and points[j + 1][0] <= ts:
+            j += 1
+        costs.append(-points[j][1] if solar else points[j][1])
+    # the last listed point must reach into the day's final hour, not be a stale leftover
+    if points[-1][0] < first + (count * SLOT_MINUTES - 60) * 60:
+        return None
+    return costs
+
+
+def attribute_points(attributes):
+    """[(start epoch, value)] from a price or forecast entity's attributes.
+
+    Accepts lists of dicts with a ``start``/``period_start`` time and a
+    ``value``/``price``/``pv_estimate`` number under ``raw_today`` and
+    ``raw_tomorrow``, ``prices`` or ``forecast``.
+    """
+    items = []
+    for key in ('raw_today', 'raw_tomorrow', 'prices', 'forecast'):
+        value = attributes.get(key)
+        if isinstance(value, list):
+            items.extend(value)
+    points = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        start = item.get('start', item.get('period_start'))
+        price = next((item[k] for k in ('value', 'price', 'pv_estimate') if item.get(k) is not None), None)
+        moment = start if isinstance(start, datetime) else dt_util.parse_datetime(str(start)) if start else None
+        if moment is None or price is None:
+            continue
+        try:
+            points.append((dt_util.as_utc(moment).timestamp(), float(price)))
+        except (TypeError, ValueError):
+            continue
+    points.sort()
+    return points
+
+
+def optimize_slots(costs, needed: int, min_run: int = 1, max_pause: int = None, fixed=None):
+    """Cheapest set of ``needed`` slots: every run lasts >= min_run slots, every pause between runs <= max_pause.
+
+    ``fixed`` pins slots to on (True) or off (False), None leaves them free;
+    replans use it to keep the part of the day that already ran. Dynamic
+    program over (slot, slots used, run/pause state); the slots-used axis is
+    a NumPy vector so a 96-slot day solves in a few milliseconds. Returns a
+    list of booleans, one per slot, or None when the constraints cannot be met.
+    """
+    import numpy as np
+
+    c = np.array(costs, dtype=np.float64)
+    slots = c.size
+    fixed = fixed or (None,) * slots
+    # never fewer than the slots pinned on
+    needed = max(0, min(max(int(needed), sum(f is True for f in fixed)), slots))
+    if needed == 0:
+        # nothing to place and nothing pinned on: an explicit all-off plan
+        return [False] * slots
+    if needed == slots and not any(f is not None for f in fixed):
+        return [True] * slots
+    c[[f is False for f in fixed]] = np.inf
+    m = max(1, min(int(min_run), needed or 1))
+    p = slots if not max_pause else max(1, min(int(max_pause), slots))
+    # states: idle before the first run | run length 1..m (m = "at least m") | pause 1..p | done
+    run0, pause0 = 1, 1 + m
+    done = pause0 + p
+    width = needed + 1
+    cur = np.full((done + 1, width), np.inf)
+    cur[0, 0] = 0.0
+    parents = np.empty((slots, done + 1, width), dtype=np.int16)
+    pause_rows = np.arange(pause0, pause0 + p - 1, dtype=np.int16)[:, None]
+    last_run = run0 + m - 1
+
+    for t in range(slots):
+        nxt = np.full_like(cur, np.inf)
+        par = parents[t]
+        par.fill(-1)
+        # pump off
+        nxt[0] = cur[0]
+        par[0] = 0
+        nxt[pause0] = cur[last_run]
+        par[pause0] = last_run
+        nxt[pause0 + 1:done] = cur[pause0:done - 1]
+        par[pause0 + 1:done] = pause_rows
+        finish = cur[last_run] < cur[done]
+        nxt[done] = np.where(finish, cur[last_run], cur[done])
+        par[done] = np.where(finish, last_run, done)
+        if fixed[t]:
+            nxt[0] = np.inf
+            nxt[pause0:] = np.inf
+        # pump on: one more slot used, so results shift one column right
+        starts = np.vstack((cur[0:1], cur[pause0:done])) + _START_PENALTY
+        sources = np.concatenate(([0], np.arange(pause0, done)))
+        if m == 1:
+            starts = np.vstack((starts, cur[run0:run0 + 1]))
+            sources = np.append(sources, run0)
+        best = np.argmin(starts, axis=0)
+        nxt[run0, 1:] = starts[best, np.arange(width)][:-1] + c[t]
+        par[run0, 1:] = sources[best][:-1]
+        if m > 1:
+            nxt[run0 + 1:last_run + 1, 1:] = cur[run0:last_run, :-1] + c[t]
+            par[run0 + 1:last_run + 1, 1:] = np.arange(run0, last_run, dtype=np.int16)[:, None]
+            keep = cur[last_run, :-1] + c[t] < nxt[last_run, 1:]
+            nxt[last_run, 1:] = np.where(keep, cur[last_run, :-1] + c[t], nxt[last_run, 1:])
+            par[last_run, 1:] = np.where(keep, last_run, par[last_run, 1:])
+        cur = nxt
+
+    # idle (never started) is a valid end too; it only holds the zero column
+    finals = [0, last_run] + list(range(pause0, done + 1))
+    state = min(finals, key=lambda s: cur[s, needed])
+    if not np.isfinite(cur[state, needed]):
+        return None
+    mask = [False] * slots
+    k = needed
+    for t in range(slots - 1, -1, -1):
+        on = run0 <= state <= last_run
+        mask[t] = on
+        state = int(parents[t, state, k])
+        if on:
+            k -= 1
+    return mask
+
+
+@lru_cache(maxsize=64)
+def _optimize_cached(costs, needed, min_run, max_pause, fixed):
+    mask = optimize_slots(costs, needed, min_run, max_pause, fixed)
+    if mask is None and fixed:
+        # what already ran may break the run/pause limits; place the rest without them
+        mask = optimize_slots(costs, needed, 1, None, fixed)
+    return mask
+
+
+def optimize_day(costs, day, total_hours: float, tz, min_run_minutes: int = SLOT_MINUTES, max_pause_minutes: int = None, fixed=None):
+    """Slot mask of the cheapest placement of total_hours on day, or None when the prices do not fit the day."""
+    if len(costs) != day_slots(day, tz)[1]:
+        return None
+    needed = int(-(-round(float(total_hours) * 60) // SLOT_MINUTES))
+    return _optimize_cached(
+        tuple(costs), needed,
+        max(1, -(-int(min_run_minutes) // SLOT_MINUTES)),
+        None if not max_pause_minutes else max(1, int(max_pause_minutes) // SLOT_MINUTES),
+        tuple(fixed) if fixed else None,
+    )
+
+
+def mask_windows(mask, day, tz):
+    """One ScheduleWindow per run of consecutive on slots."""
+    start = day_slots(day, tz)[0]
+    windows = []
+    run_start = None
+    for i, on in enumerate(mask + [False]):
+        if on and run_start is None:
+            run_start = i
+        elif not on and run_start is not None:
+            windows.append(ScheduleWindow(
+                (start + timedelta(minutes=run_start * SLOT_MINUTES)).astimezone(tz),
+                (start + timedelta(minutes=i * SLOT_MINUTES)).astimezone(tz),
+            ))
+            run_start = None
+    return tuple(windows)
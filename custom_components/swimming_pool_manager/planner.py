@@ -0,0 +1,164 @@
+"""Plan computation: inputs gathered on the loop, a pure compute stage that may run in a worker thread."""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from time import perf_counter
+from .calculation import compute_filtration_duration_cubic, compute_schedule_windows, merge_intervals
+from .const import DOMAIN, DATA_PLAN_EXECUTOR, PLAN_WORKERS
+from .forecast import update_horizon
+from .optimizer import SLOT_MINUTES, day_slots, mask_windows, optimize_day, profile_costs, series_costs
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CancelToken:
+    """Set by the next plan request of the same pool; a cancelled compute stops early and is never applied."""
+
+    __slots__ = ('cancelled',)
+
+    def __init__(self):
+        self.cancelled = False
+
+
+class PlanInputs:
+    """Everything the compute stage reads, captured on the loop so the worker touches no hass state."""
+
+    __slots__ = (
+        'token', 'now', 'today', 'tz', 'water', 'coef_pct', 'coeffs', 'pivot_hour', 'pause_minutes',
+        'profile', 'points', 'solar', 'min_run', 'max_pause', 'masks', 'rolling', 'outlook', 'horizon',
+    )
+
+    def __init__(self, token=None, now=None, today=None, tz=None, water=None, coef_pct=None, coeffs=None,
+                 pivot_hour=None, pause_minutes=None, profile=None, points=None, solar=None, min_run=None,
+                 max_pause=None, masks=None, rolling=None, outlook=None, horizon=None):
+        # spelled out rather than a setattr loop: built once per pivot for every pool
+        self.token, self.now, self.today, self.tz = token, now, today, tz
+        self.water, self.coef_pct, self.coeffs = water, coef_pct, coeffs
+        self.pivot_hour, self.pause_minutes = pivot_hour, pause_minutes
+        self.profile, self.points, self.solar = profile, points, solar
+        self.min_run, self.max_pause, self.masks = min_run, max_pause, masks
+        self.rolling, self.outlook, self.horizon = rolling, outlook, horizon
+
+    @property
+    def heavy(self):
+        # only tariff optimization is worth a thread hop; the cubic and pivot split take microseconds
+        return self.water is not None and bool(self.profile or self.points)
+
+
+class PlanResult:
+    __slots__ = ('hours', 'windows', 'intervals', 'masks', 'horizon', 'horizon_windows', 'horizon_computed', 'compute_ms')
+
+    def __init__(self, hours, windows, intervals=None, masks=None, horizon=None, horizon_windows=None, horizon_computed=0, compute_ms=0.0):
+        self.hours = hours
+        self.windows = windows
+        self.intervals = intervals
+        self.masks = masks or {}
+        self.horizon = horizon or {}
+        self.horizon_windows = horizon_windows or {}
+        self.horizon_computed = horizon_computed
+        self.compute_ms = compute_ms
+
+
+def _pinned_slots(previous, day, tz, now, count):
+    """Pin the slots of day's previous plan up to and including the current one.
+
+    A replan then only moves the remaining runtime; without this every
+    temperature change could re-place runs over slots that already ran.
+    """
+    if previous is None or len(previous) != count:
+        return None
+    start = day_slots(day, tz)[0]
+    elapsed = int((now - start).total_seconds() // (SLOT_MINUTES * 60)) + 1
+    if elapsed <= 0:
+        return None
+    return [previous[i] if i < elapsed else None for i in range(count)]
+
+
+def _day_costs(inputs, day):
+    if inputs.profile:
+        return profile_costs(inputs.profile, day, inputs.tz)
+    if inputs.points:
+        return series_costs(inputs.points, day, inputs.tz, inputs.solar)
+    return None
+
+
+def day_windows(inputs, day, total_hours, masks):
+    """Cheapest tariff placement of the day's runtime when prices cover the day, else the pivot split.
+
+    New slot masks are written to masks; inputs.masks (the previous plan) is only read.
+    """
+    costs = _day_costs(inputs, day)
+    if costs is not None:
+        previous = inputs.masks.get(day)
+        mask = optimize_day(
+            costs, day, total_hours, inputs.tz, inputs.min_run, inputs.max_pause,
+            _pinned_slots(previous, day, inputs.tz, inputs.now, len(costs)),
+        )
+        if mask is None:
+            # not enough of the day left for the new duration: keep what was planned
+            mask = previous
+        if mask is not None:
+            masks[day] = mask
+            return mask_windows(mask, day, inputs.tz)
+    return compute_schedule_windows(inputs.pivot_hour, inputs.pause_minutes, total_hours, day=day, tz=inputs.tz)
+
+
+def compute_plan(inputs):
+    """Filtration hours, today's windows and, when rolling, the absolute runs from
+    yesterday's pivot to the end of the forecast horizon.
+
+    Future days use their forecast hours (today's when there is no forecast,
+    which keeps the window before tomorrow's pivot armed). Windows
+    straddling midnight or already under way are kept; the next pivot
+    replaces future runs through the timer diff if the plan changes.
+    Thread-safe; returns None when the token was cancelled midway.
+    """
+    started = perf_counter()
+    if inputs.water is None:
+        return PlanResult(None, ())
+    hours = compute_filtration_duration_cubic(inputs.water, inputs.coef_pct, coeffs=inputs.coeffs)
+    horizon, computed = update_horizon(inputs.horizon or {}, inputs.outlook or (), inputs.coef_pct, inputs.coeffs)
+    masks = {}
+    windows = day_windows(inputs, inputs.today, hours, masks)
+    intervals = None
+    ahead = {}
+    if inputs.rolling:
+        runs = [(w.start_ts, w.end_ts) for w in windows]
+        tomorrow = inputs.today + timedelta(days=1)
+        days = [(inputs.today - timedelta(days=1), hours)]
+        days.append((tomorrow, horizon[tomorrow].hours if tomorrow in horizon else hours))
+        days.extend((day, entry.hours) for day, entry in sorted(horizon.items()) if day > tomorrow)
+        for day, day_hours in days:
+            if inputs.token.cancelled:
+                return None
+            day_plan = day_windows(inputs, day, day_hours, masks)
+            if day > inputs.today:
+                ahead[day] = day_plan
+            runs.extend((window.start_ts, window.end_ts) for window in day_plan)
+        intervals = merge_intervals(runs)
+    return PlanResult(hours, windows, intervals, masks, horizon, ahead, computed, (perf_counter() - started) * 1000.0)
+
+
+class PlanExecutor:
+    """Dedicated worker threads for heavy plans, shared by every pool.
+
+    Deliberately small: the compute stage is partly pure Python, and each
+    extra busy thread competes with the event loop for the GIL.
+    """
+
+    def __init__(self, hass, workers=PLAN_WORKERS):
+        self.hass = hass
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{DOMAIN}_plan")
+
+    async def async_run(self, func, *args):
+        return await self.hass.loop.run_in_executor(self._pool, func, *args)
+
+    def async_shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def async_get_plan_executor(hass):
+    executor = hass.data.get(DATA_PLAN_EXECUTOR)
+    if executor is None:
+        executor = hass.data[DATA_PLAN_EXECUTOR] = PlanExecutor(hass)
+    return executor
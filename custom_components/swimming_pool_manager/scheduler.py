@@ -0,0 +1,136 @@
+"""Fleet-wide timer heap shared by every PoolController."""
+import heapq
+import itertools
+import logging
+from datetime import timedelta
+from homeassistant.core import HassJob, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+from .const import DATA_SCHEDULER
+
+LOGGER = logging.getLogger(__name__)
+
+# rebuild the heap once cancelled entries outnumber live ones past this size
+_COMPACT_MIN = 64
+# the loop timer is never armed further ahead than this; re-arming against the
+# wall clock keeps long waits from drifting with the monotonic clock
+MAX_ARM_SECONDS = 3600
+
+
+class TimerHandle:
+    __slots__ = ('when', 'job', 'cancelled', '_scheduler')
+
+    def __init__(self, scheduler, when, job):
+        self._scheduler = scheduler
+        self.when = when
+        self.job = job
+        self.cancelled = False
+
+    def cancel(self):
+        self._scheduler._cancel(self)
+
+
+class PoolScheduler:
+    """Single loop timer armed on the earliest deadline of a heap.
+
+    Insert is O(log n); cancel marks the entry and is O(1), dead entries are
+    skipped when popped and the heap is compacted when they dominate.
+    """
+
+    def __init__(self, hass):
+        self.hass = hass
+        self._heap = []
+        self._seq = itertools.count()
+        self._pending = 0
+        self._cancelled = 0
+        self._armed_at = None
+        self._unsub = None
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def now(self):
+        return dt_util.utcnow()
+
+    @callback
+    def async_schedule_at(self, when, action):
+        """Run action(now) at the aware datetime when; returns a TimerHandle."""
+        ts = when.timestamp()
+        handle = TimerHandle(self, ts, HassJob(action))
+        heapq.heappush(self._heap, (ts, next(self._seq), handle))
+        self._pending += 1
+        if self._armed_at is None or ts < self._armed_at:
+            self._arm()
+        return handle
+
+    @callback
+    def async_schedule_in(self, delay, action):
+        return self.async_schedule_at(self.now() + timedelta(seconds=max(0.0, float(delay))), action)
+
+    def _cancel(self, handle):
+        if handle.cancelled:
+            return
+        handle.cancelled = True
+        self._pending -= 1
+        self._cancelled += 1
+        if self._cancelled > _COMPACT_MIN and self._cancelled > self._pending:
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def _arm(self):
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        self._armed_at = None
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+        if not self._heap:
+            return
+        self._armed_at = min(self._heap[0][0], self.now().timestamp() + MAX_ARM_SECONDS)
+        self._unsub = async_track_point_in_utc_time(self.hass, self._fire, dt_util.utc_from_timestamp(self._armed_at))
+
+    @callback
+    def _fire(self, now):
+        self._unsub = None
+        self._armed_at = None
+        # never early: a callback must see the clock at or past its deadline, or a
+        # pivot would recompute the same boundary and arm it again; timers sharing
+        # a deadline still go out in one batch, later ones re-arm the loop timer
+        current = self.now()
+        limit = current.timestamp()
+        due = []
+        while self._heap and self._heap[0][0] <= limit:
+            handle = heapq.heappop(self._heap)[2]
+            if handle.cancelled:
+                self._cancelled -= 1
+                continue
+            # a fired handle can no longer be cancelled
+            handle.cancelled = True
+            self._pending -= 1
+            due.append(handle)
+        if due:
+            LOGGER.debug("Dispatching %d timers (%d pending)", len(due), self._pending)
+        for handle in due:
+            self.hass.async_run_hass_job(handle.job, current)
+        self._arm()
+
+    @callback
+    def async_shutdown(self):
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        self._armed_at = None
+        self._heap.clear()
+        self._pending = 0
+        self._cancelled = 0
+
+
+@callback
+def async_get_scheduler(hass):
+    scheduler = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = PoolScheduler(hass)
+    return scheduler
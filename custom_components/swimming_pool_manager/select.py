@@ -3,6 +3,7 @@ import logging
 from homeassistant.components.select import SelectEntity
 from homeassistant.helpers.entity_platform import async_get_current_platform
 from datetime import time
+from .const import DOMAIN
 
 LOGGER = logging.getLogger(__name__)
 
@@ -17,20 +18,29 @@ TIME_OPTIONS = _generate_times()
 
 async def async_setup_entry(hass, entry, async_add_entities):
     controller = hass.data.get(DOMAIN, {}).get(entry.entry_id)
-    entity = PivotSelect(controller, entry.entry_id)
+    entity = PivotSelect(controller)
     async_add_entities([entity])
 
 class PivotSelect(SelectEntity):
-    def __init__(self, controller, entry_id):
+    _attr_should_poll = False
+    _attr_options = TIME_OPTIONS
+
+    def __init__(self, controller):
         self.controller = controller
-        self._entry_id = entry_id
-        self._attr_name = f"Pool Pivot Hour {entry_id}"
-        self._attr_unique_id = f"{entry_id}_pivot_select"
-        self._attr_options = TIME_OPTIONS
-        self._attr_current_option = controller.config.get('pivot_hour')
+
+    @property
+    def name(self):
+        return f"Pool Pivot Hour {self.controller.entry_id}"
+
+    @property
+    def unique_id(self):
+        return f"{self.controller.entry_id}_pivot_select"
+
+    @property
+    def current_option(self):
+        return self.controller.config.get('pivot_hour')
 
     async def async_select_option(self, option: str):
         LOGGER.info("PivotSelect set %s", option)
-        self.controller.update_config('pivot_hour', option)
-        self._attr_current_option = option
-        self.async_write_ha_state()
\ No newline at end of file
+        await self.controller.async_update_config('pivot_hour', option)
+        self.async_write_ha_state()
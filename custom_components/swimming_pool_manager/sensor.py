@@ -1,56 +1,206 @@
-"""Sensor exposing filtration hours and windows."""
+"""Sensors exposing filtration hours and windows, the runtime ledger and diagnostics."""
 import logging
-from homeassistant.components.sensor import SensorEntity
-from .calculation import compute_filtration_duration_cubic, compute_schedule_windows
+from datetime import timedelta
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.util import dt as dt_util
+from .const import DOMAIN
+from .entity import PoolEntity
 
 LOGGER = logging.getLogger(__name__)
 
+# (key, label, unit, state class, value extracted from controller.sensor_diagnostics())
+DIAGNOSTIC_SENSORS = [
+    ('pivot_duration', "Pivot Duration", 'ms', SensorStateClass.MEASUREMENT, lambda d: d['pivot_ms']),
+    ('loop_block', "Plan Loop Block", 'ms', SensorStateClass.MEASUREMENT, lambda d: d['loop_block_ms']),
+    ('pump_latency', "Pump Command Latency", 'ms', SensorStateClass.MEASUREMENT, lambda d: d['pump_latency_ms']),
+    ('robot_latency', "Robot Command Latency", 'ms', SensorStateClass.MEASUREMENT, lambda d: d['robot_latency_ms']),
+    ('timer_drift', "Timer Drift", 'ms', SensorStateClass.MEASUREMENT, lambda d: d['timer_drift_ms']),
+    ('start_jitter', "Pump Start Jitter", 'ms', SensorStateClass.MEASUREMENT, lambda d: d['start_jitter_ms']),
+    ('armed_timers', "Armed Timers", None, SensorStateClass.MEASUREMENT, lambda d: d['armed_timers']),
+    ('recomputes', "Plan Recomputes", None, SensorStateClass.TOTAL_INCREASING, lambda d: d['recomputes']),
+]
+
+# (key, label, unit, state class, reset period, value from the ledger snapshot); periodic totals
+# carry last_reset so long-term statistics come straight from the states, never from history scans
+LEDGER_SENSORS = [
+    ('runtime_today', "Runtime Today", UnitOfTime.HOURS, SensorStateClass.TOTAL, 'day', lambda s: round(s.today_h, 2)),
+    ('runtime_week', "Runtime This Week", UnitOfTime.HOURS, SensorStateClass.TOTAL, 'week', lambda s: round(s.week_h, 2)),
+    ('runtime_season', "Runtime This Season", UnitOfTime.HOURS, SensorStateClass.TOTAL, 'season', lambda s: round(s.season_h, 1)),
+    ('runtime_total', "Runtime Total", UnitOfTime.HOURS, SensorStateClass.TOTAL_INCREASING, None, lambda s: round(s.total_h, 1)),
+    ('pump_starts_today', "Pump Starts Today", None, SensorStateClass.TOTAL, 'day', lambda s: s.starts_today),
+    ('pump_starts', "Pump Starts", None, SensorStateClass.TOTAL_INCREASING, None, lambda s: s.starts_total),
+    ('runtime_vs_plan', "Runtime vs Plan", UnitOfTime.HOURS, SensorStateClass.MEASUREMENT, None,
+     lambda s: None if s.planned_h is None else round(s.today_h - s.planned_h, 2)),
+]
+
 async def async_setup_entry(hass, entry, async_add_entities):
-    async_add_entities([PoolFiltrationSensor(hass, entry.data, entry.entry_id)])
+    controller = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    entities = [PoolFiltrationSensor(controller, entry.entry_id), PoolOutlookSensor(controller, entry.entry_id)]
+    entities.extend(PoolLedgerSensor(controller, entry.entry_id, *spec) for spec in LEDGER_SENSORS)
+    entities.extend(
+        PoolDiagnosticSensor(controller, entry.entry_id, *spec)
+        for spec in DIAGNOSTIC_SENSORS
+        if spec[0] != 'robot_latency' or controller.config.get('robot_switch')
+    )
+    async_add_entities(entities)
+
+def _hhmm(moment):
+    return dt_util.as_local(moment).strftime('%H:%M')
+
+
+class PoolFiltrationSensor(PoolEntity, SensorEntity):
+    # full ISO windows stay on the state for automations but out of the database;
+    # the recorded 'schedule' string only changes when an edge moves within the day
+    _unrecorded_attributes = frozenset({'windows'})
 
-class PoolFiltrationSensor(SensorEntity):
-    def __init__(self, hass, conf, entry_id):
-        self.hass = hass
-        self.conf = conf
+    def __init__(self, controller, entry_id):
         self.entry_id = entry_id
         self._attr_name = "Pool Filtration Hours"
         self._attr_unique_id = f"{entry_id}_filtration_hours"
-        self._state = None
-        self._attrs = {}
+        self._key = None
+        self._windows = None
+        self._rendered = None
+        super().__init__(controller)
+
+    def _extract(self, data):
+        hours = data.get('filtration_hours')
+        if hours is None:
+            self._key = None
+            return None, {}
+        windows = data.get('schedule_windows') or ()
+        if windows is not self._windows:
+            # window tuples are shared per plan (LRU cache, planner result), so they are
+            # only rendered again when the plan hands over a new one
+            self._windows = windows
+            self._rendered = (
+                ' '.join(f"{_hhmm(w.start)}-{_hhmm(w.end)}" for w in windows),
+                [[w.start_iso, w.end_iso] for w in windows],
+            )
+        key = (round(hours, 2), self._rendered[0], data.get('pivot_hour'), data.get('pause_minutes'), data.get('adjust_coeff_pct'))
+        if key == self._key:
+            # same rounded hours and schedule: hand back the cached value, no write
+            return self._value
+        self._key = key
+        return key[0], {
+            'pivot': key[2],
+            'pause_minutes': key[3],
+            'coef_pct': key[4],
+            'schedule': self._rendered[0],
+            'windows': self._rendered[1],
+        }
 
     @property
     def native_value(self):
-        return self._state
+        return self._value[0]
 
     @property
     def extra_state_attributes(self):
-        return self._attrs
-
-    async def async_update(self):
-        temp_entity = self.conf.get('water_temp_sensor')
-        temp_state = self.hass.states.get(temp_entity)
-        if not temp_state:
-            self._state = None
-            self._attrs = {}
-            return
-        try:
-            t = float(temp_state.state)
-        except Exception:
-            self._state = None
-            self._attrs = {}
-            return
-
-        coef = int(self.conf.get('adjust_coeff_pct',100))
-        pause = int(self.conf.get('pause_minutes',0))
-        pivot = self.conf.get('pivot_hour')
-
-        hours = compute_filtration_duration_cubic(t, coef)
-        windows = compute_schedule_windows(pivot, pause, hours)
-
-        self._state = round(hours,2)
-        self._attrs = {
-            'pivot': pivot,
-            'pause_minutes': pause,
-            'coef_pct': coef,
-            'windows': [{ 'start': w[0].isoformat(), 'end': w[1].isoformat() } for w in windows]
-        }
+        return self._value[1]
+
+class PoolOutlookSensor(PoolEntity, SensorEntity):
+    """Tomorrow's planned hours and schedule, with the rest of the rolling horizon as an attribute."""
+
+    _unrecorded_attributes = frozenset({'days'})
+
+    def __init__(self, controller, entry_id):
+        self._attr_name = "Pool Filtration Hours Tomorrow"
+        self._attr_unique_id = f"{entry_id}_filtration_hours_tomorrow"
+        self._attr_native_unit_of_measurement = UnitOfTime.HOURS
+        self._key = None
+        super().__init__(controller)
+
+    def _extract(self, data):
+        # after midnight and before the next plan, the first planned day is already today
+        today = data.get('today')
+        horizon = tuple(entry for entry in data.get('horizon') or () if today is None or entry.day > today)
+        if not horizon:
+            self._key = None
+            return None, {}
+        if horizon == self._key:
+            # precomputed by the planner; only reformatted when the horizon moves
+            return self._value
+        self._key = horizon
+        days = [{
+            'date': entry.day.isoformat(),
+            'water_temp': entry.temp,
+            'hours': round(entry.hours, 2),
+            'schedule': ' '.join(f"{_hhmm(w.start)}-{_hhmm(w.end)}" for w in entry.windows),
+        } for entry in horizon]
+        return days[0]['hours'], {'schedule': days[0]['schedule'], 'days': days}
+
+    @property
+    def native_value(self):
+        return self._value[0]
+
+    @property
+    def extra_state_attributes(self):
+        return self._value[1]
+
+
+def _period_start(day, period):
+    if period == 'week':
+        day = day - timedelta(days=day.weekday())
+    elif period == 'season':
+        day = day.replace(month=1, day=1)
+    return dt_util.start_of_local_day(day)
+
+
+class PoolLedgerSensor(PoolEntity, SensorEntity):
+    """Pump runtime and start counters from the controller's RuntimeLedger."""
+
+    def __init__(self, controller, entry_id, key, label, unit, state_class, period, value_fn):
+        self._period = period
+        self._value_fn = value_fn
+        self._attr_name = f"Pool {label} {entry_id}"
+        self._attr_unique_id = f"{entry_id}_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = SensorDeviceClass.DURATION if unit else None
+        self._attr_state_class = state_class
+        super().__init__(controller)
+
+    def _extract(self, data):
+        ledger = data.get('ledger')
+        if ledger is None:
+            return None, None
+        return self._value_fn(ledger), ledger.day if self._period else None
+
+    @property
+    def native_value(self):
+        return self._value[0]
+
+    @property
+    def last_reset(self):
+        day = self._value[1]
+        return None if day is None else _period_start(day, self._period)
+
+
+class PoolDiagnosticSensor(PoolEntity, SensorEntity):
+    """Controller instrumentation; percentile metrics report p95 with p50 and max as attributes."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unrecorded_attributes = frozenset({'p50', 'max'})
+
+    def __init__(self, controller, entry_id, key, label, unit, state_class, value_fn):
+        self._value_fn = value_fn
+        self._attr_name = f"Pool {label} {entry_id}"
+        self._attr_unique_id = f"{entry_id}_diag_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+        super().__init__(controller)
+
+    def _extract(self, data):
+        value = self._value_fn(self.controller.sensor_diagnostics())
+        if isinstance(value, dict):
+            # rounded, and without the per-sample 'last'/'count', so a new sample rarely means a new state
+            p95, p50, high = (None if value[k] is None else round(value[k], 1) for k in ('p95', 'p50', 'max'))
+            return p95, {'p50': p50, 'max': high}
+        return value, None
+
+    @property
+    def native_value(self):
+        return self._value[0]
+
+    @property
+    def extra_state_attributes(self):
+        return self._value[1]
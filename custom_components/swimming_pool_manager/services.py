@@ -0,0 +1,159 @@
+"""Integration-level services acting on any number of pools per call."""
+import asyncio
+import logging
+from time import perf_counter
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, device_registry as dr, entity_registry as er
+from .calibration import async_calibrate
+from .const import DOMAIN, MODES, PROFILE_BACKENDS, FLEET_CONCURRENCY, CALIBRATION_DEFAULT_DAYS
+
+LOGGER = logging.getLogger(__name__)
+
+SERVICES = ("set_mode", "recompute", "force_pump", "profile_pivot", "calibrate_curve")
+
+TARGET_SCHEMA = {
+    vol.Optional("entry_id"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("area_id"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("all", default=False): cv.boolean,
+}
+
+
+def _pool_area(hass, controller):
+    # a pool lives where its pump switch (or that switch's device) is
+    entity = er.async_get(hass).async_get(controller.config.get('pump_switch') or '')
+    if entity is None:
+        return None
+    if entity.area_id:
+        return entity.area_id
+    device = dr.async_get(hass).async_get(entity.device_id) if entity.device_id else None
+    return device.area_id if device else None
+
+
+def _async_targets(hass, data):
+    controllers = hass.data.get(DOMAIN, {})
+    if data.get("all"):
+        return list(controllers.values())
+    entry_ids = set(data.get("entry_id") or ())
+    areas = set(data.get("area_id") or ())
+    if not entry_ids and not areas:
+        raise HomeAssistantError("No pool selected: give entry_id, area_id or all")
+    unknown = entry_ids - set(controllers)
+    if unknown:
+        raise HomeAssistantError(f"Unknown pool entries: {', '.join(sorted(unknown))}")
+    return [
+        controller for entry_id, controller in controllers.items()
+        if entry_id in entry_ids or (areas and _pool_area(hass, controller) in areas)
+    ]
+
+
+def _summary(controller):
+    return {
+        'mode': controller.data.mode,
+        'filtration_active': controller.data.filtration_active,
+        'filtration_hours': controller.data.filtration_hours,
+    }
+
+
+async def _async_fan_out(targets, action):
+    """Run action(controller) for every target, FLEET_CONCURRENCY at a time; failures are reported, not raised."""
+    semaphore = asyncio.Semaphore(FLEET_CONCURRENCY)
+    started = perf_counter()
+
+    async def _one(controller):
+        async with semaphore:
+            try:
+                result = await action(controller)
+            except Exception as err:  # one broken pool must not fail the batch
+                LOGGER.exception("Fleet call failed for %s", controller.entry_id)
+                return controller.entry_id, {'ok': False, 'error': str(err)}
+            return controller.entry_id, {'ok': True, **(result or _summary(controller))}
+
+    results = dict(await asyncio.gather(*(_one(controller) for controller in targets)))
+    failed = sum(1 for result in results.values() if not result['ok'])
+    return {
+        'pools': len(results),
+        'succeeded': len(results) - failed,
+        'failed': failed,
+        'duration_ms': round((perf_counter() - started) * 1000.0, 1),
+        'results': results,
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    if hass.services.has_service(DOMAIN, "set_mode"):
+        return
+
+    async def handle_set_mode(call):
+        mode = call.data["mode"]
+        return await _async_fan_out(_async_targets(hass, call.data), lambda c: c.async_set_mode(mode))
+
+    async def handle_recompute(call):
+        return await _async_fan_out(_async_targets(hass, call.data), lambda c: c.async_recompute())
+
+    async def handle_force_pump(call):
+        on = call.data["on"]
+        return await _async_fan_out(_async_targets(hass, call.data), lambda c: c.async_set_pump(on))
+
+    async def handle_profile_pivot(call):
+        controllers = hass.data.get(DOMAIN, {})
+        entry_id = call.data.get("entry_id")
+        if entry_id is not None and entry_id not in controllers:
+            raise HomeAssistantError(f"Unknown pool entry {entry_id}")
+        targets = [controllers[entry_id]] if entry_id is not None else list(controllers.values())
+        for target in targets:
+            path = await target.async_set_profiling(call.data["enabled"], call.data["backend"])
+            if path:
+                LOGGER.warning("Pivot profile for %s saved to %s", target.entry_id, path)
+
+    async def handle_calibrate_curve(call):
+        entry_id = call.data["entry_id"]
+        target = hass.data.get(DOMAIN, {}).get(entry_id)
+        config_entry = hass.config_entries.async_get_entry(entry_id)
+        if target is None or config_entry is None:
+            raise HomeAssistantError(f"Unknown pool entry {entry_id}")
+        try:
+            return await async_calibrate(hass, config_entry, target, call.data["days"], call.data["min_coverage"])
+        except ValueError as err:
+            raise HomeAssistantError(f"Calibration failed: {err}") from err
+
+    hass.services.async_register(
+        DOMAIN, "set_mode", handle_set_mode,
+        schema=vol.Schema({**TARGET_SCHEMA, vol.Required("mode"): vol.In(MODES)}),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, "recompute", handle_recompute,
+        schema=vol.Schema(TARGET_SCHEMA),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, "force_pump", handle_force_pump,
+        schema=vol.Schema({**TARGET_SCHEMA, vol.Required("on"): cv.boolean}),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, "profile_pivot", handle_profile_pivot,
+        schema=vol.Schema({
+            vol.Optional("entry_id"): cv.string,
+            vol.Optional("enabled", default=True): cv.boolean,
+            vol.Optional("backend", default="cprofile"): vol.In(PROFILE_BACKENDS),
+        }),
+    )
+    hass.services.async_register(
+        DOMAIN, "calibrate_curve", handle_calibrate_curve,
+        schema=vol.Schema({
+            vol.Required("entry_id"): cv.string,
+            vol.Optional("days", default=CALIBRATION_DEFAULT_DAYS): vol.All(vol.Coerce(int), vol.Range(min=7, max=3650)),
+            vol.Optional("min_coverage", default=0.9): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=1.0)),
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    for service in SERVICES:
+        hass.services.async_remove(DOMAIN, service)
@@ -0,0 +1,380 @@
+"""Offline season simulation of a PoolController on a virtual clock.
+
+A temperature series (CSV or Parquet) is replayed against a local stand-in
+for ``hass``: an in-memory state machine, a service registry that flips the
+simulated switches, and a scheduler whose clock jumps straight to the next
+due timer. A year of samples runs in seconds.
+
+    python -m custom_components.swimming_pool_manager.simulation series.csv --pivot 14:00
+
+CSV columns: ``timestamp,water_temp,outdoor_temp`` (naive timestamps are
+read in the configured time zone).
+"""
+import argparse
+import asyncio
+import csv
+import heapq
+import json
+import logging
+from dataclasses import dataclass, field
+from homeassistant.util import dt as dt_util
+from .const import DATA_SCHEDULER, DATA_COMMAND_BUS, DATA_PLAN_EXECUTOR
+from .controller import PoolController
+from .metrics import RingBuffer
+from .scheduler import PoolScheduler
+
+LOGGER = logging.getLogger(__name__)
+
+WATER_SENSOR = 'sensor.sim_water_temperature'
+OUTDOOR_SENSOR = 'sensor.sim_outdoor_temperature'
+PUMP_SWITCH = 'switch.sim_pump'
+
+
+class SimState:
+    __slots__ = ('entity_id', 'state')
+
+    def __init__(self, entity_id, state):
+        self.entity_id = entity_id
+        self.state = state
+
+
+class SimStates:
+    def __init__(self):
+        self._states = {}
+
+    def get(self, entity_id):
+        return self._states.get(entity_id)
+
+    def async_set(self, entity_id, state):
+        self._states[entity_id] = SimState(entity_id, str(state))
+
+
+class SimServices:
+    def __init__(self, hass):
+        self._hass = hass
+        self.calls = []
+
+    async def async_call(self, domain, service, data=None, blocking=False, **kwargs):
+        entity_id = (data or {}).get('entity_id')
+        self.calls.append((domain, service, entity_id))
+        if domain == 'switch' and service in ('turn_on', 'turn_off'):
+            self._hass.states.async_set(entity_id, 'on' if service == 'turn_on' else 'off')
+
+
+class SimBus:
+    def async_listen(self, *args, **kwargs):
+        return lambda: None
+
+    def async_listen_once(self, *args, **kwargs):
+        return lambda: None
+
+
+class SimStore:
+    """In-memory plan store: nothing is read at start and saves are kept, not written."""
+
+    def __init__(self):
+        self._data = None
+        self._data_func = None
+        self.saves = 0
+
+    @property
+    def data(self):
+        # like the HA Store, a delayed save only builds its payload when it is written (here: read)
+        if self._data_func is not None:
+            self._data, self._data_func = self._data_func(), None
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        # seeds a warm restart
+        self._data, self._data_func = value, None
+
+    async def async_load(self):
+        return self.data
+
+    def async_delay_save(self, data_func, delay=0):
+        self.saves += 1
+        self._data_func = data_func
+
+    async def async_save(self, data):
+        self.saves += 1
+        self._data, self._data_func = data, None
+
+    async def async_remove(self):
+        self._data = self._data_func = None
+
+
+class SimHass:
+    """Just enough of HomeAssistant for the controller, on the running loop."""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.data = {}
+        self.states = SimStates()
+        self.services = SimServices(self)
+        self.bus = SimBus()
+        self._tasks = set()
+
+    def async_create_task(self, target, name=None, **kwargs):
+        task = self.loop.create_task(target)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async_create_background_task = async_create_task
+
+    async def async_add_executor_job(self, target, *args):
+        return target(*args)
+
+    def async_run_hass_job(self, job, *args):
+        result = job.target(*args)
+        if asyncio.iscoroutine(result):
+            return self.async_create_task(result)
+        return None
+
+    async def async_block_till_done(self):
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+
+class VirtualScheduler(PoolScheduler):
+    """PoolScheduler on a virtual clock: no loop timer, time jumps to the next deadline."""
+
+    def __init__(self, hass, start):
+        super().__init__(hass)
+        self._clock = start
+
+    def now(self):
+        return self._clock
+
+    def _arm(self):
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+        self._armed_at = self._heap[0][0] if self._heap else None
+
+    async def async_advance_to(self, when):
+        limit = when.timestamp()
+        while True:
+            self._arm()
+            if self._armed_at is None or self._armed_at > limit:
+                break
+            self._clock = dt_util.utc_from_timestamp(self._armed_at)
+            self._fire(self._clock)
+            await self.hass.async_block_till_done()
+        self._clock = when
+
+
+class SimCommandBus:
+    """Applies switch commands instantly and records the pump timeline."""
+
+    def __init__(self, hass, scheduler):
+        self.hass = hass
+        self._scheduler = scheduler
+        self.timeline = []
+        self.commands = 0
+
+    def async_submit(self, entity_id, on: bool):
+        state = self.hass.states.get(entity_id)
+        if state is not None and (state.state == 'on') == on:
+            return
+        self.commands += 1
+        self.hass.states.async_set(entity_id, 'on' if on else 'off')
+        if entity_id == PUMP_SWITCH:
+            self.timeline.append((self._scheduler.now(), on))
+
+    def latency_summary(self, entity_id):
+        return RingBuffer().summary()
+
+    def async_shutdown(self):
+        pass
+
+
+class InlinePlanExecutor:
+    """Computes plans on the loop so a replay stays deterministic."""
+
+    async def async_run(self, func, *args):
+        return func(*args)
+
+    def async_shutdown(self):
+        pass
+
+
+class _SimController(PoolController):
+    """Sensor readings are fed by the replay loop rather than state events."""
+
+    def __init__(self, hass, config, entry_id):
+        super().__init__(hass, config, entry_id)
+        self.frost_events = []
+        self._last_mode = None
+
+    def _create_store(self):
+        return SimStore()
+
+    def _track_sensors(self):
+        pass
+
+    def _publish(self):
+        super()._publish()
+        mode = self.data.mode
+        if mode == 'frost' and self._last_mode != 'frost':
+            self.frost_events.append(self._now())
+        self._last_mode = mode
+
+
+@dataclass
+class SimulationResult:
+    start: object
+    end: object
+    timeline: list = field(default_factory=list)
+    frost_events: list = field(default_factory=list)
+    runtime_hours: float = 0.0
+    commands: int = 0
+
+    def as_dict(self, with_timeline=False):
+        out = {
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat(),
+            'runtime_hours': round(self.runtime_hours, 2),
+            'pump_starts': sum(1 for _, on in self.timeline if on),
+            'frost_events': [ts.isoformat() for ts in self.frost_events],
+            'commands': self.commands,
+        }
+        if with_timeline:
+            out['timeline'] = [{'at': ts.isoformat(), 'on': on} for ts, on in self.timeline]
+        return out
+
+
+def _parse_ts(value):
+    ts = dt_util.parse_datetime(str(value))
+    if ts is None:
+        raise ValueError(f"Invalid timestamp {value!r}")
+    return dt_util.as_utc(ts)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def load_series(path):
+    """Return [(utc datetime, water, outdoor)] sorted by time from a CSV or Parquet file."""
+    rows = []
+    if str(path).endswith('.parquet'):
+        import pandas as pd
+
+        frame = pd.read_parquet(path)
+        for ts, water, outdoor in frame[['timestamp', 'water_temp', 'outdoor_temp']].itertuples(index=False):
+            rows.append((_parse_ts(ts.isoformat() if hasattr(ts, 'isoformat') else ts), _to_float(water), _to_float(outdoor)))
+    else:
+        with open(path, newline='', encoding='utf-8') as handle:
+            for row in csv.DictReader(handle):
+                rows.append((_parse_ts(row['timestamp']), _to_float(row.get('water_temp')), _to_float(row.get('outdoor_temp'))))
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+def _runtime_hours(timeline, end):
+    total = 0.0
+    on_since = None
+    for ts, on in timeline:
+        if on and on_since is None:
+            on_since = ts
+        elif not on and on_since is not None:
+            total += (ts - on_since).total_seconds()
+            on_since = None
+    if on_since is not None:
+        total += (end - on_since).total_seconds()
+    return total / 3600.0
+
+
+def _set_temps(hass, water, outdoor):
+    hass.states.async_set(WATER_SENSOR, 'unavailable' if water is None else water)
+    hass.states.async_set(OUTDOOR_SENSOR, 'unavailable' if outdoor is None else outdoor)
+
+
+async def async_simulate(series, config: dict, mode: str = 'ete') -> SimulationResult:
+    """Replay series against a PoolController and return the pump timeline."""
+    if not series:
+        raise ValueError("Empty temperature series")
+    hass = SimHass()
+    start, end = series[0][0], series[-1][0]
+    scheduler = hass.data[DATA_SCHEDULER] = VirtualScheduler(hass, start)
+    bus = hass.data[DATA_COMMAND_BUS] = SimCommandBus(hass, scheduler)
+    hass.data[DATA_PLAN_EXECUTOR] = InlinePlanExecutor()
+    config = {
+        'water_temp_sensor': WATER_SENSOR,
+        'outdoor_temp_entity': OUTDOOR_SENSOR,
+        'pump_switch': PUMP_SWITCH,
+        **config,
+    }
+    hass.states.async_set(PUMP_SWITCH, 'off')
+    _set_temps(hass, series[0][1], series[0][2])
+
+    controller = _SimController(hass, config, 'simulation')
+    controller.mode = mode
+    await controller.initialize()
+    await hass.async_block_till_done()
+
+    for ts, water, outdoor in series[1:]:
+        await scheduler.async_advance_to(ts)
+        _set_temps(hass, water, outdoor)
+        controller._record('water', hass.states.get(WATER_SENSOR))
+        controller._record('outdoor', hass.states.get(OUTDOOR_SENSOR))
+        # one evaluation per sample stands in for the debounced state events
+        await controller._async_evaluate_temperatures()
+        await hass.async_block_till_done()
+
+    await controller.shutdown()
+    return SimulationResult(
+        start=start,
+        end=end,
+        timeline=bus.timeline,
+        frost_events=controller.frost_events,
+        runtime_hours=_runtime_hours(bus.timeline, end),
+        commands=bus.commands,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('series', help="CSV or Parquet temperature series")
+    parser.add_argument('--pivot', default='14:00')
+    parser.add_argument('--pause', type=int, default=0, help="pause minutes")
+    parser.add_argument('--cut', type=int, default=60, help="winter cut duration minutes")
+    parser.add_argument('--coef', type=int, default=100, help="adjust coefficient pct")
+    parser.add_argument('--no-frost', type=float, default=0.0, help="frost threshold (°C)")
+    parser.add_argument('--tariff', help="daily tariff profile (HH:MM,price CSV or JSON) to optimize runs against")
+    parser.add_argument('--min-run', type=int, default=60, help="minimum run minutes with --tariff")
+    parser.add_argument('--max-pause', type=int, default=240, help="maximum pause minutes with --tariff")
+    parser.add_argument('--forecast', help="daily air temperature forecast (YYYY-MM-DD,temp CSV or forecast JSON) for the multi-day planner")
+    parser.add_argument('--forecast-days', type=int, default=3, help="days planned ahead with --forecast")
+    parser.add_argument('--mode', default='ete')
+    parser.add_argument('--tz', default='UTC', help="time zone of the simulated installation")
+    parser.add_argument('--timeline', action='store_true', help="include every pump edge in the output")
+    parser.add_argument('--log-level', default='ERROR')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper())
+
+    dt_util.set_default_time_zone(dt_util.get_time_zone(args.tz))
+    config = {
+        'pivot_hour': args.pivot,
+        'pause_minutes': args.pause,
+        'cut_duration_minutes': args.cut,
+        'adjust_coeff_pct': args.coef,
+        'no_frost_temperature': args.no_frost,
+        'tariff_file': args.tariff,
+        'min_run_minutes': args.min_run,
+        'max_pause_minutes': args.max_pause,
+        'forecast_file': args.forecast,
+        'forecast_days': args.forecast_days,
+    }
+    result = asyncio.run(async_simulate(load_series(args.series), config, args.mode))
+    print(json.dumps(result.as_dict(args.timeline), indent=2))
+
+
+if __name__ == '__main__':
+    main()
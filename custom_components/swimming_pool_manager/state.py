@@ -0,0 +1,122 @@
+"""Slotted per-pool state: immutable config snapshots and the runtime plan state."""
+from collections.abc import Mapping
+from .const import (
+    CONF_WATER_TEMP, CONF_PUMP_SWITCH, CONF_PIVOT_HOUR, CONF_PAUSE_MINUTES, CONF_CUT_DURATION_MIN, CONF_OUTDOOR_TEMP,
+    CONF_NO_FROST_TEMP, CONF_ROBOT_ENABLED, CONF_ROBOT_SWITCH, CONF_ADJUST_COEFF, CONF_TEMP_DEBOUNCE_SEC,
+    CONF_TEMP_HYSTERESIS, CONF_TEMP_AVERAGE_MINUTES, CONF_CALIBRATION, CONF_TARIFF_ENTITY, CONF_TARIFF_FILE,
+    CONF_TARIFF_SOLAR, CONF_MIN_RUN_MINUTES, CONF_MAX_PAUSE_MINUTES, CONF_ROBOT_LEAD_MINUTES, CONF_ROBOT_DURATION_MINUTES,
+    CONF_FORECAST_ENTITY, CONF_FORECAST_FILE, CONF_FORECAST_DAYS,
+)
+
+_UNSET = object()
+
+CONFIG_FIELDS = (
+    CONF_WATER_TEMP, CONF_PUMP_SWITCH, CONF_PIVOT_HOUR, CONF_PAUSE_MINUTES, CONF_CUT_DURATION_MIN, CONF_OUTDOOR_TEMP,
+    CONF_NO_FROST_TEMP, CONF_ROBOT_ENABLED, CONF_ROBOT_SWITCH, CONF_ADJUST_COEFF, CONF_TEMP_DEBOUNCE_SEC,
+    CONF_TEMP_HYSTERESIS, CONF_TEMP_AVERAGE_MINUTES, CONF_CALIBRATION, CONF_TARIFF_ENTITY, CONF_TARIFF_FILE,
+    CONF_TARIFF_SOLAR, CONF_MIN_RUN_MINUTES, CONF_MAX_PAUSE_MINUTES, CONF_ROBOT_LEAD_MINUTES, CONF_ROBOT_DURATION_MINUTES,
+    CONF_FORECAST_ENTITY, CONF_FORECAST_FILE, CONF_FORECAST_DAYS,
+)
+_FIELD_SET = frozenset(CONFIG_FIELDS)
+
+
+class PoolConfig(Mapping):
+    """Immutable snapshot of a pool's options, read like the entry data dict.
+
+    Known options live in slots (unset ones hold a shared sentinel); unknown
+    keys are kept aside rather than dropped. A change builds a new snapshot
+    with replace(), so a reader never sees a half-applied update.
+    """
+
+    __slots__ = CONFIG_FIELDS + ('_extra',)
+
+    def __init__(self, values=(), **changes):
+        merged = dict(values, **changes)
+        for name in CONFIG_FIELDS:
+            object.__setattr__(self, name, merged.pop(name, _UNSET))
+        object.__setattr__(self, '_extra', merged or None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PoolConfig is immutable, use replace()")
+
+    def replace(self, **changes):
+        return PoolConfig(self, **changes)
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+        else:
+            value = self._extra.get(key, _UNSET) if self._extra else _UNSET
+        return default if value is _UNSET else value
+
+    def __getitem__(self, key):
+        value = self.get(key, _UNSET)
+        if value is _UNSET:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        for name in CONFIG_FIELDS:
+            if getattr(self, name) is not _UNSET:
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"PoolConfig({dict(self)!r})"
+
+
+class PoolState:
+    """Runtime plan state of one pool.
+
+    The controller mutates its own instance; entities get frozen-in-time
+    copies through the coordinator and read them with get(), like the dict
+    snapshots they replace. Windows are ScheduleWindow tuples (epoch seconds),
+    ledger a RuntimeLedger snapshot, horizon ForecastDay entries for the days ahead
+    and today the local day of the snapshot (horizon days after it are still ahead).
+    """
+
+    __slots__ = (
+        'filtration_active', 'robot_active', 'mode', 'pivot_hour', 'pause_minutes',
+        'adjust_coeff_pct', 'filtration_hours', 'schedule_windows', 'ledger', 'horizon', 'today',
+    )
+
+    def __init__(self, **values):
+        self.filtration_active = False
+        self.robot_active = False
+        self.mode = None
+        self.pivot_hour = None
+        self.pause_minutes = None
+        self.adjust_coeff_pct = None
+        self.filtration_hours = None
+        self.schedule_windows = ()
+        self.ledger = None
+        self.horizon = ()
+        self.today = None
+        self.update(values)
+
+    def update(self, values):
+        for key, value in values.items():
+            if key in _STATE_FIELDS:
+                setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in _STATE_FIELDS else default
+
+    def copy(self):
+        clone = PoolState.__new__(PoolState)
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"PoolState({self.as_dict()!r})"
+
+
+_STATE_FIELDS = frozenset(PoolState.__slots__)
@@ -2,73 +2,56 @@
 import logging
 from homeassistant.components.switch import SwitchEntity
 from .const import DOMAIN
+from .entity import PoolEntity
 
 LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     conf = entry.data
-    entities = [PoolPumpSwitch(hass, conf, entry.entry_id)]
+    controller = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    entities = [PoolPumpSwitch(controller, entry.entry_id)]
     if conf.get('robot_enabled') and conf.get('robot_switch'):
-        entities.append(PoolRobotSwitch(hass, conf, entry.entry_id))
+        entities.append(PoolRobotSwitch(controller, entry.entry_id))
     async_add_entities(entities)
 
-class PoolPumpSwitch(SwitchEntity):
-    def __init__(self, hass, conf, entry_id):
-        self.hass = hass
-        self.conf = conf
+class PoolPumpSwitch(PoolEntity, SwitchEntity):
+    def __init__(self, controller, entry_id):
         self.entry_id = entry_id
         self._attr_name = "Pool Pump"
         self._attr_unique_id = f"{entry_id}_pump"
-        self._is_on = False
+        super().__init__(controller)
+
+    def _extract(self, data):
+        return bool(data.get('filtration_active'))
 
     @property
     def is_on(self):
-        return self._is_on
+        return self._value
 
     async def async_turn_on(self, **kwargs):
-        pump = self.conf.get('pump_switch')
-        LOGGER.info("Turning pump ON (%s)", pump)
-        await self.hass.services.async_call('switch','turn_on',{'entity_id': pump})
-        self._is_on = True
+        LOGGER.info("Turning pump ON (%s)", self.controller.config.get('pump_switch'))
+        await self.controller.async_set_pump(True)
 
     async def async_turn_off(self, **kwargs):
-        pump = self.conf.get('pump_switch')
-        LOGGER.info("Turning pump OFF (%s)", pump)
-        await self.hass.services.async_call('switch','turn_off',{'entity_id': pump})
-        self._is_on = False
-
-    async def async_update(self):
-        # reflect controller recommended state
-        controller = self.hass.data.get(DOMAIN, {}).get(self.entry_id)
-        if controller and controller.data.get('mode') == 'frost':
-            # frost mode forces pump on
-            if not self._is_on:
-                await self.async_turn_on()
-            return
-        # otherwise do nothing; controller schedules via service calls
+        LOGGER.info("Turning pump OFF (%s)", self.controller.config.get('pump_switch'))
+        await self.controller.async_set_pump(False)
 
-class PoolRobotSwitch(SwitchEntity):
-    def __init__(self, hass, conf, entry_id):
-        self.hass = hass
-        self.conf = conf
+class PoolRobotSwitch(PoolEntity, SwitchEntity):
+    def __init__(self, controller, entry_id):
         self.entry_id = entry_id
         self._attr_name = "Pool Robot"
         self._attr_unique_id = f"{entry_id}_robot"
+        super().__init__(controller)
+
+    def _extract(self, data):
+        return bool(data.get('robot_active'))
 
     @property
     def is_on(self):
-        robot = self.conf.get('robot_switch')
-        if not robot:
-            return False
-        state = self.hass.states.get(robot)
-        return state and state.state == 'on'
+        return self._value
 
     async def async_turn_on(self, **kwargs):
-        robot = self.conf.get('robot_switch')
-        if robot:
-            await self.hass.services.async_call('switch','turn_on',{'entity_id': robot})
+        await self.controller.async_set_robot(True)
 
     async def async_turn_off(self, **kwargs):
-        robot = self.conf.get('robot_switch')
-        if robot:
-            await self.hass.services.async_call('switch','turn_off',{'entity_id': robot})
+        await self.controller.async_set_robot(False)
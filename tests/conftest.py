@@ -0,0 +1,7 @@
+"""Controller tests on the simulator's stubbed hass; needs Home Assistant importable, no running instance."""
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
@@ -0,0 +1,91 @@
+"""Warm restarts through the plan store: state the previous instance left running is taken over."""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.swimming_pool_manager import simulation as sim  # noqa: E402
+from custom_components.swimming_pool_manager.const import DATA_COMMAND_BUS, DATA_SCHEDULER  # noqa: E402
+
+ROBOT_SWITCH = 'switch.sim_robot'
+START = dt_util.as_utc(datetime(2025, 7, 1, 9, 0))
+CONFIG = {
+    'water_temp_sensor': sim.WATER_SENSOR,
+    'outdoor_temp_entity': sim.OUTDOOR_SENSOR,
+    'pump_switch': sim.PUMP_SWITCH,
+    'pivot_hour': '14:00',
+    'pause_minutes': 30,
+    'robot_enabled': True,
+    'robot_switch': ROBOT_SWITCH,
+    'robot_lead_minutes': 30,
+    'robot_duration_minutes': 600,
+}
+
+
+def _pool(now, pump='off', robot='off'):
+    hass = sim.SimHass()
+    scheduler = hass.data[DATA_SCHEDULER] = sim.VirtualScheduler(hass, now)
+    hass.data[DATA_COMMAND_BUS] = sim.SimCommandBus(hass, scheduler)
+    hass.states.async_set(sim.PUMP_SWITCH, pump)
+    hass.states.async_set(ROBOT_SWITCH, robot)
+    sim._set_temps(hass, 26.0, 22.0)
+    return hass, scheduler, sim._SimController(hass, CONFIG, 'pool')
+
+
+async def _advance_until(hass, scheduler, done, limit=timedelta(days=1)):
+    end = scheduler.now() + limit
+    while not done() and scheduler.now() < end:
+        await scheduler.async_advance_to(scheduler.now() + timedelta(minutes=5))
+        await hass.async_block_till_done()
+    assert done(), "condition not reached within the limit"
+
+
+async def _robot_running_payload():
+    """Run a pool until its robot starts, then shut it down as on an HA restart."""
+    hass, scheduler, controller = _pool(START)
+    await controller.initialize()
+    await _advance_until(hass, scheduler, lambda: controller.data.robot_active)
+    payload = controller._cache_payload()
+    await controller.shutdown()
+    return scheduler.now(), payload
+
+
+async def _restart(now, payload):
+    hass, scheduler, controller = _pool(now, pump='on', robot='on')
+    controller._store.data = payload
+    await controller.async_restore()
+    await controller.initialize()
+    await hass.async_block_till_done()
+    return hass, scheduler, controller
+
+
+def test_robot_running_across_restart_stops_with_the_pump():
+    async def run():
+        now, payload = await _robot_running_payload()
+        assert payload['robot'][0] is not None
+        hass, scheduler, controller = await _restart(now + timedelta(minutes=1), payload)
+        assert controller.data.robot_active
+        await _advance_until(hass, scheduler, lambda: hass.states.get(sim.PUMP_SWITCH).state == 'off')
+        assert hass.states.get(ROBOT_SWITCH).state == 'off'
+        assert not controller.data.robot_active
+        await controller.shutdown()
+
+    asyncio.run(run())
+
+
+def test_robot_found_on_without_saved_state_stops_with_the_pump():
+    async def run():
+        now, payload = await _robot_running_payload()
+        # a plan saved before the robot state was persisted
+        payload.pop('robot', None)
+        hass, scheduler, controller = await _restart(now + timedelta(minutes=1), payload)
+        assert controller.data.robot_active
+        await _advance_until(hass, scheduler, lambda: hass.states.get(sim.PUMP_SWITCH).state == 'off')
+        assert hass.states.get(ROBOT_SWITCH).state == 'off'
+        await controller.shutdown()
+
+    asyncio.run(run())